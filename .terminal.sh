@@ -33,6 +33,8 @@ SESSION_FILE="$CONFIG_DIR/session"
 PROMPT_FILE="$CONFIG_DIR/prompt"
 BANNER_FILE="$CONFIG_DIR/banner"
 PREFS_FILE="$CONFIG_DIR/preferences"
+PASSWD_HELPER="$SCRIPT_DIR/zehrasec_passwd.py"
+PYTHON_BIN="$(command -v python3 || command -v python)"
 
 # Security settings
 MAX_FAIL_ATTEMPTS=3
@@ -55,6 +57,13 @@ DEFAULT_BANNER_FILE="zehrasec_inc.txt"
 PREDEFINED_PROMPTS=("ZehraSec" "Terminal" "Secure" "Admin" "Root" "Cyber" "Hacker" "Matrix" "Shell" "Console")
 DEFAULT_PROMPT="ZehraSec"
 
+# Terminal control sequences, looked up once instead of forking tput per use
+init_terminal_caps() {
+    TPUT_CIVIS=$(tput civis 2>/dev/null)
+    TPUT_CNORM=$(tput cnorm 2>/dev/null)
+    TPUT_CLEAR=$(tput clear 2>/dev/null || printf '\033[H\033[2J')
+}
+
 # Initialize configuration directory
 init_config() {
     if [[ ! -d "$CONFIG_DIR" ]]; then
@@ -63,11 +72,55 @@ init_config() {
     fi
 }
 
-# Logging function
+# printf's %(...)T needs bash 4.2+; older shells (macOS /bin/bash 3.2) fork date instead
+if printf '%(%s)T' -1 >/dev/null 2>&1; then
+    PRINTF_HAS_TIME=true
+else
+    PRINTF_HAS_TIME=false
+fi
+
+# Escape $1 as a JSON string body into JSON_ESCAPED, the way json.dumps does:
+# backslash, quote, \n \t \r \b \f, and \u00XX for every other control character
+json_escape() {
+    local text="$1" out="" char i
+    text=${text//\\/\\\\}
+    text=${text//\"/\\\"}
+    if [[ "$text" == *[[:cntrl:]]* ]]; then
+        for (( i = 0; i < ${#text}; i++ )); do
+            char="${text:i:1}"
+            case "$char" in
+                $'\n') out+='\n' ;;
+                $'\t') out+='\t' ;;
+                $'\r') out+='\r' ;;
+                $'\b') out+='\b' ;;
+                $'\f') out+='\f' ;;
+                [[:cntrl:]]) printf -v char '\\u%04x' "'$char"; out+="$char" ;;
+                *) out+="$char" ;;
+            esac
+        done
+        text=$out
+    fi
+    JSON_ESCAPED=$text
+}
+
+# Logging function: one JSON record per line, same shape as the Python audit log
+# Usage: log_activity "message" [event] [level]
 log_activity() {
     local message="$1"
-    local timestamp=$(date '+%Y-%m-%d %H:%M:%S')
-    echo "[$timestamp] $message" >> "$LOG_FILE"
+    local event="${2:-message}"
+    local level="${3:-INFO}"
+    local ts
+    if [[ "$PRINTF_HAS_TIME" == true ]]; then
+        printf -v ts '%(%Y-%m-%dT%H:%M:%S%z)T' -1
+    else
+        ts=$(date +%Y-%m-%dT%H:%M:%S%z)
+    fi
+    json_escape "$message"
+    message=$JSON_ESCAPED
+    json_escape "$event"
+    event=$JSON_ESCAPED
+    printf '{"ts":"%s","level":"%s","event":"%s","source":"bash","message":"%s"}\n' \
+        "$ts" "$level" "$event" "$message" >> "$LOG_FILE"
 }
 
 # Typing effect
@@ -75,10 +128,31 @@ type_text() {
     local text="$1"
     local speed="${2:-$TYPING_SPEED}"
     
-    if [[ "$ENABLE_ANIMATIONS" == "true" && "$speed" != "0" ]]; then
-        for (( i=0; i<${#text}; i++ )); do
-            echo -n "${text:$i:1}"
-            sleep "$speed"
+    # Seconds per character in microseconds, without forking a calculator
+    local whole=${speed%%.*} frac=""
+    [[ "$speed" == *.* ]] && frac=${speed#*.}
+    frac="${frac}000000"
+    local speed_us=$(( 10#${whole:-0} * 1000000 + 10#${frac:0:6} ))
+    
+    if [[ "$ENABLE_ANIMATIONS" == "true" && $speed_us -gt 0 && -t 1 ]]; then
+        # Write a slice of characters every ~50ms; a key press prints the rest at once
+        local chunk=$(( (50000 + speed_us - 1) / speed_us ))
+        local slice_us=$(( chunk * speed_us ))
+        local slice key
+        printf -v slice '%d.%06d' $((slice_us / 1000000)) $((slice_us % 1000000))
+        
+        for (( i=0; i<${#text}; i+=chunk )); do
+            printf '%s' "${text:i:chunk}"
+            if (( i + chunk < ${#text} )); then
+                if [[ -t 0 ]]; then
+                    if read -rsn1 -t "$slice" key; then
+                        printf '%s' "${text:i+chunk}"
+                        break
+                    fi
+                else
+                    sleep "$slice"
+                fi
+            fi
         done
         echo
     else
@@ -91,33 +165,35 @@ matrix_rain() {
     local duration="${1:-$MATRIX_DURATION}"
     local colors=("$GREEN" "$CYAN" "$WHITE" "$BLUE")
     local chars="ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789@#$%^&*"
-    local width=$(tput cols 2>/dev/null || echo 80)
-    local height=$(tput lines 2>/dev/null || echo 24)
+    local width=${COLUMNS:-$(tput cols 2>/dev/null || echo 80)}
+    local height=${LINES:-$(tput lines 2>/dev/null || echo 24)}
     
     if [[ "$ENABLE_ANIMATIONS" != "true" ]]; then
         return
     fi
     
-    local end_time=$(($(date +%s) + duration))
+    [[ -n "$TPUT_CLEAR" ]] || init_terminal_caps
     
-    clear
-    tput civis 2>/dev/null # Hide cursor
+    # Each frame is built as one buffer of ANSI cursor moves and written once
+    local end_time=$((SECONDS + duration))
+    local frame cell col
     
-    while [[ $(date +%s) -lt $end_time ]]; do
-        for ((col=0; col<width; col++)); do
+    printf '%s%s' "$TPUT_CLEAR" "$TPUT_CIVIS"
+    
+    while (( SECONDS < end_time )); do
+        frame=""
+        for ((col=1; col<=width; col++)); do
             if (( RANDOM % 20 == 0 )); then
-                local row=$((RANDOM % height + 1))
-                local char=${chars:$((RANDOM % ${#chars})):1}
-                local color=${colors[$((RANDOM % ${#colors[@]}))]}
-                tput cup $row $col 2>/dev/null
-                echo -ne "${color}${char}${RESET}"
+                printf -v cell '\033[%d;%dH%b%s' $((RANDOM % height + 1)) "$col" \
+                    "${colors[RANDOM % ${#colors[@]}]}" "${chars:RANDOM % ${#chars}:1}"
+                frame+=$cell
             fi
         done
+        printf '%s%b' "$frame" "$RESET"
         sleep 0.05
     done
     
-    tput cnorm 2>/dev/null # Show cursor
-    clear
+    printf '%s%s' "$TPUT_CNORM" "$TPUT_CLEAR"
 }
 
 # Load ASCII art
@@ -165,10 +241,36 @@ get_current_prompt() {
     fi
 }
 
-# Password hashing
-hash_password() {
-    local password="$1"
-    echo -n "$password" | sha256sum | cut -d' ' -f1
+# Password hashing: zehrasec_passwd.py owns the hash format shared with the Python edition.
+# One helper process per check; the password travels over a pipe, never argv or a temp file.
+# No --scheme/--rounds: the helper keeps the scheme and cost the Python edition chose.
+# Returns 0 on success, 1 for a wrong password, 2 on error (reason printed, e.g. bcrypt unavailable).
+passwd_helper() {
+    local action="$1"
+    local password="$2"
+    if [[ -z "$PYTHON_BIN" || ! -f "$PASSWD_HELPER" ]]; then
+        echo -e "${RED}❌ Password hashing needs Python 3 and $PASSWD_HELPER${RESET}" >&2
+        return 2
+    fi
+    local error status
+    error=$(printf '%s\n' "$password" | "$PYTHON_BIN" "$PASSWD_HELPER" "$action" "$PASS_FILE" 2>&1 >/dev/null)
+    status=$?
+    if [[ $status -eq 2 ]]; then
+        error=${error#zehrasec_passwd: }
+        echo -e "${RED}❌ Password $action failed: ${error:-password helper error}${RESET}" >&2
+        log_activity "Password $action failed: ${error:-password helper error}" password_error ERROR
+    fi
+    return $status
+}
+
+# Verify a password, upgrading legacy sha256 hashes in place
+verify_password() {
+    passwd_helper verify "$1"
+}
+
+# Store a new password hash
+set_password() {
+    passwd_helper set "$1"
 }
 
 # Check password strength
@@ -193,7 +295,7 @@ check_lockout() {
         if [[ $time_diff -lt $LOCKOUT_DURATION ]]; then
             local remaining=$((LOCKOUT_DURATION - time_diff))
             echo -e "${RED}Account locked. Try again in $remaining seconds.${RESET}"
-            log_activity "Account locked - attempted access during lockout period"
+            log_activity "Account locked - attempted access during lockout period" lockout WARNING
             return 1
         else
             rm -f "$LOCK_FILE" "$FAILS_FILE"
@@ -220,15 +322,16 @@ authenticate() {
         read -s password
         echo
         
-        local hashed_password=$(hash_password "$password")
-        
         if [[ -f "$PASS_FILE" ]]; then
-            local stored_hash=$(cat "$PASS_FILE")
-            if [[ "$hashed_password" == "$stored_hash" ]]; then
+            verify_password "$password"
+            local status=$?
+            if [[ $status -eq 2 ]]; then
+                return 1
+            elif [[ $status -eq 0 ]]; then
                 echo -e "${GREEN}✅ Authentication successful${RESET}"
                 rm -f "$FAILS_FILE"
                 echo "$(date +%s)" > "$SESSION_FILE"
-                log_activity "Successful login"
+                log_activity "Successful login" login_success
                 return 0
             fi
         else
@@ -244,11 +347,12 @@ authenticate() {
             echo
             
             if [[ "$password" == "$confirm_password" ]]; then
-                echo "$hashed_password" > "$PASS_FILE"
-                chmod 600 "$PASS_FILE"
+                if ! set_password "$password"; then
+                    return 1
+                fi
                 echo -e "${GREEN}✅ Password set successfully${RESET}"
                 echo "$(date +%s)" > "$SESSION_FILE"
-                log_activity "Password set - first run"
+                log_activity "Password set - first run" password_set
                 return 0
             else
                 echo -e "${RED}❌ Passwords do not match${RESET}"
@@ -260,12 +364,12 @@ authenticate() {
         attempts=$((attempts + 1))
         echo "$attempts" > "$FAILS_FILE"
         echo -e "${RED}❌ Authentication failed ($attempts/$max_attempts)${RESET}"
-        log_activity "Failed login attempt ($attempts/$max_attempts)"
+        log_activity "Failed login attempt ($attempts/$max_attempts)" login_failure WARNING
         
         if [[ $attempts -ge $max_attempts ]]; then
             echo "$(date +%s)" > "$LOCK_FILE"
             echo -e "${RED}🔒 Account locked for $LOCKOUT_DURATION seconds${RESET}"
-            log_activity "Account locked after $max_attempts failed attempts"
+            log_activity "Account locked after $max_attempts failed attempts" lockout WARNING
             return 1
         fi
         
@@ -283,7 +387,7 @@ validate_session() {
         if [[ $session_age -gt $SESSION_TIMEOUT ]]; then
             echo -e "${YELLOW}⚠️ Session expired${RESET}"
             rm -f "$SESSION_FILE"
-            log_activity "Session expired"
+            log_activity "Session expired" session_expired WARNING
             return 1
         fi
     else
@@ -299,12 +403,13 @@ change_password() {
     read -s current_password
     echo
     
-    local current_hash=$(hash_password "$current_password")
-    local stored_hash=$(cat "$PASS_FILE")
-    
-    if [[ "$current_hash" != "$stored_hash" ]]; then
+    verify_password "$current_password"
+    local status=$?
+    if [[ $status -eq 2 ]]; then
+        return 1
+    elif [[ $status -ne 0 ]]; then
         echo -e "${RED}❌ Current password incorrect${RESET}"
-        log_activity "Failed password change - incorrect current password"
+        log_activity "Failed password change - incorrect current password" password_change_failed WARNING
         return 1
     fi
     
@@ -323,10 +428,11 @@ change_password() {
     echo
     
     if [[ "$new_password" == "$confirm_password" ]]; then
-        local new_hash=$(hash_password "$new_password")
-        echo "$new_hash" > "$PASS_FILE"
+        if ! set_password "$new_password"; then
+            return 1
+        fi
         echo -e "${GREEN}✅ Password changed successfully${RESET}"
-        log_activity "Password changed successfully"
+        log_activity "Password changed successfully" password_changed
     else
         echo -e "${RED}❌ Passwords do not match${RESET}"
         return 1
@@ -908,7 +1014,7 @@ main_loop() {
             "logout" | "exit")
                 echo -e "${YELLOW}Goodbye! Stay secure with ZehraSec! 🛡️${RESET}"
                 rm -f "$SESSION_FILE"
-                log_activity "User logout"
+                log_activity "User logout" session_end
                 exit 0
                 ;;
             "")
@@ -928,6 +1034,7 @@ main_loop() {
 main() {
     # Initialize
     init_config
+    init_terminal_caps
     
     # Welcome screen
     clear
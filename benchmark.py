@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+ZehraSec Terminal - Benchmarks
+Micro-benchmarks for performance-sensitive parts of the terminal
+
+Usage:
+    python benchmark.py matrix [--frames N] [--height ROWS]
+    python benchmark.py session [--commands N]
+    python benchmark.py top [--spawn N] [--refreshes N]
+    python benchmark.py attempts [--procs N] [--failures N] [--max-attempts N]
+    python benchmark.py tokens [--iterations N]
+"""
+
+import os
+import sys
+import random
+import hashlib
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import subprocess
+import multiprocessing
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import zehrasec_terminal as zt
+
+def bench_matrix(args):
+    """Compare the rain engines and the full and incremental renderers"""
+    effect = zt.MatrixEffect()
+    engines = ["python"] + (["numpy"] if zt.numpy_available() else [])
+    if len(engines) == 1:
+        print("NumPy is not installed; only the pure-Python engine is measured.")
+    
+    print(f"{'engine':<8} {'columns':>8} {'rows':>6} {'step ms':>9} {'full ms':>9} {'diff ms':>9} "
+          f"{'full B':>8} {'diff B':>8} {'diff fps':>9}")
+    for width in args.widths:
+        for engine in engines:
+            rain = effect.create_rain(width, args.height, engine)
+            for _ in range(args.height):  # warm up until the screen is populated
+                rain.step()
+            
+            step_time = full_time = diff_time = 0.0
+            full_bytes = diff_bytes = 0
+            for render in ("full", "diff"):
+                for _ in range(args.frames):
+                    start = time.perf_counter()
+                    rain.step()
+                    middle = time.perf_counter()
+                    buffer = rain.frame() if render == "full" else rain.diff()
+                    elapsed = time.perf_counter() - middle
+                    step_time += middle - start
+                    if render == "full":
+                        full_time += elapsed
+                        full_bytes += len(buffer)
+                    else:
+                        diff_time += elapsed
+                        diff_bytes += len(buffer)
+            
+            frames = args.frames
+            step_ms = step_time / (2 * frames) * 1000
+            diff_ms = diff_time / frames * 1000
+            print(f"{engine:<8} {width:>8} {args.height:>6} {step_ms:>9.3f} "
+                  f"{full_time / frames * 1000:>9.3f} {diff_ms:>9.3f} "
+                  f"{full_bytes // frames:>8} {diff_bytes // frames:>8} "
+                  f"{1000 / (step_ms + diff_ms):>9.1f}")
+
+class SyscallCounter:
+    """Count file system calls made inside a `with` block"""
+    
+    AUDIT_EVENTS = {"open": "open", "os.rename": "rename", "os.remove": "remove", "os.scandir": "scandir"}
+    _active = None
+    
+    def __init__(self):
+        self.counts = dict.fromkeys(["open", "stat", "rename", "remove", "scandir", "read", "write"], 0)
+        
+    @classmethod
+    def _audit(cls, event, args):
+        counter = cls._active
+        if counter is not None and event in cls.AUDIT_EVENTS:
+            counter.counts[cls.AUDIT_EVENTS[event]] += 1
+    
+    @staticmethod
+    def _proc_io():
+        """read()/write() syscall totals from /proc (Linux only)"""
+        try:
+            with open("/proc/self/io") as f:
+                fields = dict(line.split(": ") for line in f.read().splitlines())
+            return int(fields["syscr"]), int(fields["syscw"])
+        except (OSError, KeyError, ValueError):
+            return None
+    
+    def __enter__(self):
+        if not getattr(SyscallCounter, "_hooked", False):
+            sys.addaudithook(SyscallCounter._audit)
+            SyscallCounter._hooked = True
+        
+        # stat() is not an audit event, so count it by wrapping os.stat for the duration
+        self._stat = os.stat
+        def counted_stat(*args, **kwargs):
+            self.counts["stat"] += 1
+            return self._stat(*args, **kwargs)
+        os.stat = counted_stat
+        
+        self._io = self._proc_io()
+        SyscallCounter._active = self
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        SyscallCounter._active = None
+        os.stat = self._stat
+        io = self._proc_io()
+        if self._io and io:
+            self.counts["read"] = io[0] - self._io[0] - 1  # minus the /proc read itself
+            self.counts["write"] = io[1] - self._io[1]
+        else:
+            self.counts["read"] = self.counts["write"] = None
+        return False
+
+def legacy_session_command(session_file: Path, timeout: float) -> bool:
+    """Per-command session handling as it was before the in-memory Session"""
+    # run(): is_session_valid() before every prompt
+    valid = False
+    if session_file.exists():
+        session_data = json.loads(session_file.read_text(encoding='utf-8'))
+        valid = (time.time() - session_data.get("last_activity", 0)) < timeout
+    
+    # process_command(): update_session_activity() after every command
+    if session_file.exists():
+        session_data = json.loads(session_file.read_text(encoding='utf-8'))
+        session_data["last_activity"] = time.time()
+        session_file.write_text(json.dumps(session_data), encoding='utf-8')
+    return valid
+
+def bench_session(args):
+    """Count file system calls per command for the old session file and the in-memory session"""
+    home = tempfile.mkdtemp(prefix="zehrasec-bench-")
+    os.environ["HOME"] = os.environ["USERPROFILE"] = home
+    config = zt.ZehraSecConfig()
+    security = zt.SecurityManager(config)
+    
+    session_file = Path(home) / "session"
+    session_file.write_text(json.dumps({"id": "bench", "start_time": time.time(),
+                                        "last_activity": time.time()}), encoding='utf-8')
+    security.create_session()
+    
+    def current():
+        security.is_session_valid()
+        security.update_session_activity()
+    
+    def legacy():
+        legacy_session_command(session_file, config.SESSION_TIMEOUT)
+    
+    columns = ["open", "stat", "rename", "read", "write"]
+    print(f"{'implementation':<16}" + "".join(f"{name:>9}" for name in columns) + f"{'us/cmd':>10}")
+    for name, command in (("session file", legacy), ("in-memory", current)):
+        with SyscallCounter() as counter:
+            start = time.perf_counter()
+            for _ in range(args.commands):
+                command()
+            elapsed = time.perf_counter() - start
+        
+        cells = ""
+        for column in columns:
+            value = counter.counts[column]
+            cells += f"{'n/a':>9}" if value is None else f"{value / args.commands:>9.2f}"
+        print(f"{name:<16}{cells}{elapsed / args.commands * 1e6:>10.1f}")
+    
+    print(f"\n{args.commands} commands; in-memory sessions are saved at most every "
+          f"{config.SESSION_PERSIST_INTERVAL}s, on exit and on SIGTERM/SIGHUP")
+    shutil.rmtree(home, ignore_errors=True)
+
+def bench_top(args):
+    """Time ProcessTop refreshes, optionally with extra idle processes on the host"""
+    children = []
+    try:
+        for _ in range(args.spawn):
+            children.append(subprocess.Popen(["sleep", "60"]))
+    except OSError as e:
+        print(f"Could only spawn {len(children)} processes: {e}")
+    
+    try:
+        print(f"{'metric':<8} {'processes':>10} {'refresh ms':>11} {'us/process':>11} {'10k est ms':>11}")
+        for metric in zt.ProcessTop.METRICS:
+            top = zt.ProcessTop()
+            top.refresh(metric)  # first pass creates the Process objects
+            start = time.perf_counter()
+            for _ in range(args.refreshes):
+                top.refresh(metric, 10)
+            per_refresh = (time.perf_counter() - start) / args.refreshes
+            per_process = per_refresh / max(1, top.count)
+            print(f"{metric:<8} {top.count:>10} {per_refresh * 1000:>11.2f} "
+                  f"{per_process * 1e6:>11.1f} {per_process * 10000 * 1000:>11.1f}")
+    finally:
+        for child in children:
+            child.kill()
+            child.wait()
+
+def _attempts_worker(home: str, failures: int, naive: bool):
+    """One login process failing repeatedly"""
+    os.environ["HOME"] = os.environ["USERPROFILE"] = home
+    if naive:
+        # The old fails file: read, add one, write back, with nothing stopping other processes
+        fails_file = Path(home) / ".zehrasec" / "fails"
+        for _ in range(failures):
+            try:
+                fails = int(fails_file.read_text() or 0)
+            except (OSError, ValueError):
+                fails = 0
+            fails_file.write_text(str(fails + 1))
+        return
+    
+    config = zt.ZehraSecConfig()
+    security = zt.SecurityManager(config)
+    for _ in range(failures):
+        security.increment_failed_attempts()
+
+def bench_attempts(args):
+    """Many processes failing logins at once: every failure must be counted exactly once"""
+    total = args.procs * args.failures
+    print(f"{args.procs} processes x {args.failures} failures, lockout after {args.max_attempts}")
+    print(f"{'store':<16} {'counted':>8} {'lost':>6} {'lockouts':>9} {'seconds':>8}")
+    for name, naive in (("plain fails file", True), ("locked record", False)):
+        home = tempfile.mkdtemp(prefix="zehrasec-bench-")
+        config_dir = Path(home) / ".zehrasec"
+        config_dir.mkdir()
+        # A long window and short lockouts keep every failure countable
+        (config_dir / "config").write_text(
+            f"MAX_FAIL_ATTEMPTS={args.max_attempts}\nRATE_LIMIT_WINDOW=86400\nLOCKOUT_DURATION=1\n")
+        
+        workers = [multiprocessing.Process(target=_attempts_worker, args=(home, args.failures, naive))
+                   for _ in range(args.procs)]
+        start = time.perf_counter()
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        elapsed = time.perf_counter() - start
+        
+        if naive:
+            counted = int((config_dir / "fails").read_text() or 0)
+            lockouts = "-"
+        else:
+            record = json.loads((config_dir / "attempts.json").read_text())
+            counted = record["lockouts"] * args.max_attempts + len(record["failures"])
+            lockouts = record["lockouts"]
+        print(f"{name:<16} {counted:>8} {total - counted:>6} {lockouts:>9} {elapsed:>8.2f}")
+        shutil.rmtree(home, ignore_errors=True)
+
+def bench_tokens(args):
+    """Session id issue and session record sign/verify throughput"""
+    home = tempfile.mkdtemp(prefix="zehrasec-bench-")
+    tokens = zt.SessionTokens(Path(home) / "session.key")
+    session_id = tokens.new_id()
+    record = {"id": session_id, "pid": os.getpid(), "process_started": time.time(), "tty": "/dev/pts/0",
+              "user": "bench", "host": "bench", "start_time": time.time(), "last_activity": time.time(),
+              "timeout": 3600, "heartbeat": time.time()}
+    sealed = tokens.seal(record)
+    payload = zt.SessionTokens._canonical(record)
+    signature = tokens.sign(payload)
+    
+    cases = [
+        ("id: sha256(time, random) (old)",
+         lambda: hashlib.sha256(f"{time.time()}{random.random()}".encode()).hexdigest()[:16]),
+        ("id: secrets.token_bytes", tokens.new_id),
+        ("sign payload", lambda: tokens.sign(payload)),
+        ("verify payload", lambda: tokens.verify(payload, signature)),
+        ("seal session record", lambda: tokens.seal(record)),
+        ("unseal session record", lambda: tokens.unseal(sealed)),
+    ]
+    print(f"{'operation':<32} {'us/op':>8} {'ops/s':>12}")
+    for name, operation in cases:
+        start = time.perf_counter()
+        for _ in range(args.iterations):
+            operation()
+        per_op = (time.perf_counter() - start) / args.iterations
+        print(f"{name:<32} {per_op * 1e6:>8.2f} {1 / per_op:>12,.0f}")
+    shutil.rmtree(home, ignore_errors=True)
+
+def main():
+    parser = argparse.ArgumentParser(description="ZehraSec Terminal benchmarks")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+    
+    matrix = subparsers.add_parser("matrix", help="Matrix rain engines")
+    matrix.add_argument("--frames", type=int, default=200)
+    matrix.add_argument("--height", type=int, default=60)
+    matrix.add_argument("--widths", type=int, nargs="+", default=[80, 240, 600])
+    matrix.set_defaults(func=bench_matrix)
+    
+    session = subparsers.add_parser("session", help="File system calls per command for session tracking")
+    session.add_argument("--commands", type=int, default=1000)
+    session.set_defaults(func=bench_session)
+    
+    top = subparsers.add_parser("top", help="Process ranking refresh time")
+    top.add_argument("--spawn", type=int, default=0, help="extra idle processes to start first")
+    top.add_argument("--refreshes", type=int, default=10)
+    top.set_defaults(func=bench_top)
+    
+    attempts = subparsers.add_parser("attempts", help="Concurrent failed logins against the attempt counter")
+    attempts.add_argument("--procs", type=int, default=16)
+    attempts.add_argument("--failures", type=int, default=50, help="failures per process")
+    attempts.add_argument("--max-attempts", type=int, default=5)
+    attempts.set_defaults(func=bench_attempts)
+    
+    tokens = subparsers.add_parser("tokens", help="Session id issue and signature throughput")
+    tokens.add_argument("--iterations", type=int, default=100000)
+    tokens.set_defaults(func=bench_tokens)
+    
+    args = parser.parse_args()
+    args.func(args)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -468,6 +468,7 @@ function Copy-Files {
     
     $filesToCopy = @(
         'zehrasec_terminal.py',
+        'zehrasec_passwd.py',
         'launch.py', 
         'demo.py',
         'test.py',
@@ -517,8 +518,7 @@ function Create-LauncherScript {
     
     $launcherContent = @"
 @echo off
-cd /d "$InstallDir"
-python zehrasec_terminal.py %*
+python "$InstallDir\launch.py" %*
 "@
     
     $launcherPath = Join-Path $BinDir "zehrasec.bat"
@@ -25,11 +25,21 @@ def clear_screen():
     """Clear the terminal screen"""
     os.system('cls' if os.name == 'nt' else 'clear')
 
-def typing_effect(text, delay=0.03):
-    """Create typing effect"""
-    for char in text:
-        print(char, end='', flush=True)
-        time.sleep(delay)
+def typing_effect(text, delay=0.03, slice_length=0.05):
+    """Create typing effect, writing the characters due in each time slice at once"""
+    if delay <= 0 or not sys.stdout.isatty():
+        print(text)
+        return
+    
+    start = time.perf_counter()
+    written = 0
+    while written < len(text):
+        due = min(len(text), int((time.perf_counter() - start) / delay) + 1)
+        sys.stdout.write(text[written:due])
+        sys.stdout.flush()
+        written = due
+        if written < len(text):
+            time.sleep(max(slice_length, delay))
     print()
 
 def display_banner():
@@ -53,16 +63,13 @@ def simple_matrix_effect(duration=3):
     
     print(f"{Colors.GREEN}Running Matrix Effect...{Colors.RESET}")
     
+    # One weighted draw per line instead of two RNG calls per character
+    cells = [" "] + [f"{Colors.GREEN}{char}{Colors.RESET}" for char in chars]
+    cum_weights = [0.9 + 0.1 * i / len(chars) for i in range(len(cells))]
+    
     end_time = time.time() + duration
     while time.time() < end_time:
-        line = ""
-        for _ in range(80):
-            if random.random() < 0.1:
-                char = random.choice(chars)
-                line += f"{Colors.GREEN}{char}{Colors.RESET}"
-            else:
-                line += " "
-        print(line)
+        print("".join(random.choices(cells, cum_weights=cum_weights, k=80)))
         time.sleep(0.05)
 
 def demonstrate_features():
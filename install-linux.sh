@@ -328,6 +328,7 @@ copy_files() {
     
     local files=(
         "zehrasec_terminal.py"
+        "zehrasec_passwd.py"
         "launch.py"
         "demo.py"
         "test.py"
@@ -376,8 +377,7 @@ create_launcher() {
 INSTALL_DIR="$INSTALL_DIR"
 PYTHON_CMD="$PYTHON_CMD"
 
-cd "\$INSTALL_DIR"
-exec "\$PYTHON_CMD" zehrasec_terminal.py "\$@"
+exec "\$PYTHON_CMD" "\$INSTALL_DIR/launch.py" "\$@"
 EOF
     
     if chmod +x "$launcher_path"; then
@@ -172,6 +172,7 @@ copy_files() {
     # Files to copy
     FILES=(
         "zehrasec_terminal.py"
+        "zehrasec_passwd.py"
         "launch.py"
         "demo.py"
         "test.py"
@@ -212,8 +213,7 @@ create_launcher() {
 # ZehraSec Terminal Launcher for Termux
 # Generated by Termux installer
 
-cd "$INSTALL_DIR"
-exec python zehrasec_terminal.py "\$@"
+exec python "$INSTALL_DIR/launch.py" "\$@"
 EOF
     
     chmod +x "$LAUNCHER_PATH"
@@ -358,6 +358,7 @@ click>=8.1.7
         
         files_to_copy = [
             'zehrasec_terminal.py',
+            'zehrasec_passwd.py',
             'launch.py',
             'demo.py',
             'test.py',
@@ -406,8 +407,7 @@ click>=8.1.7
 INSTALL_DIR="{self.install_dir}"
 PYTHON_CMD="{self.detector.python_cmd}"
 
-cd "$INSTALL_DIR"
-exec "$PYTHON_CMD" zehrasec_terminal.py "$@"
+exec "$PYTHON_CMD" "$INSTALL_DIR/launch.py" "$@"
 """
         
         launcher_path = self.bin_dir / 'zehrasec'
@@ -11,33 +11,59 @@ Support Email: yashabalam707@gmail.com
 import sys
 import subprocess
 import os
+import hashlib
+import importlib.util
 from pathlib import Path
 
+# Packages zehrasec_terminal.py needs at runtime
+REQUIRED_MODULES = ["colorama", "rich", "psutil", "bcrypt"]
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+STAMP_FILE = Path.home() / ".zehrasec" / "launch.stamp"
+
+def requirements_key() -> str:
+    """Identify the interpreter and requirements a successful check applies to"""
+    digest = hashlib.sha256()
+    digest.update(sys.executable.encode('utf-8'))
+    digest.update(sys.version.encode('utf-8'))
+    requirements = SCRIPT_DIR / "requirements.txt"
+    if requirements.exists():
+        digest.update(requirements.read_bytes())
+    return digest.hexdigest()
+
 def check_requirements():
     """Check if requirements are installed"""
+    key = requirements_key()
     try:
-        import colorama
-        import rich
-        import pyfiglet
-        import psutil
-        import bcrypt
-        return True
-    except ImportError:
+        if STAMP_FILE.read_text(encoding='utf-8').strip() == key:
+            return True
+    except OSError:
+        pass
+    
+    # find_spec locates packages without importing them
+    if any(importlib.util.find_spec(name) is None for name in REQUIRED_MODULES):
         return False
+    
+    try:
+        STAMP_FILE.parent.mkdir(exist_ok=True)
+        STAMP_FILE.write_text(key, encoding='utf-8')
+    except OSError:
+        pass
+    return True
 
 def install_requirements():
     """Install required packages"""
     print("Installing required packages...")
     try:
-        subprocess.check_call([sys.executable, "-m", "pip", "install", "-r", "requirements.txt"])
+        subprocess.check_call([sys.executable, "-m", "pip", "install", "-r", str(SCRIPT_DIR / "requirements.txt")])
         return True
     except subprocess.CalledProcessError:
         return False
 
 def main():
     """Main launcher function"""
-    script_dir = Path(__file__).parent
-    main_script = script_dir / "zehrasec_terminal.py"
+    main_script = SCRIPT_DIR / "zehrasec_terminal.py"
+    args = sys.argv[1:]
     
     if not main_script.exists():
         print("Error: zehrasec_terminal.py not found!")
@@ -53,7 +79,16 @@ def main():
     
     # Launch the terminal
     try:
-        subprocess.run([sys.executable, str(main_script)])
+        if "--subprocess" in args:
+            args.remove("--subprocess")
+            subprocess.run([sys.executable, str(main_script)] + args)
+            return 0
+        
+        # Run in this interpreter; importing also reuses the cached bytecode
+        sys.path.insert(0, str(SCRIPT_DIR))
+        sys.argv = [str(main_script)] + args
+        import zehrasec_terminal
+        zehrasec_terminal.main()
         return 0
     except KeyboardInterrupt:
         print("\nLauncher interrupted.")
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+ZehraSec Terminal - Password Hashes
+Shared credential format for ~/.zehrasec/pass, used by both the Python and Bash editions
+
+Format:
+    $zs1$bcrypt$<bcrypt hash>
+    $zs1$scrypt$n=<N>,r=<r>,p=<p>$<salt, base64>$<key, base64>
+
+Older files hold a bare bcrypt hash (Python edition) or an unsalted sha256 hex digest
+(Bash edition). Both still verify, and `verify` rewrites them in the current format.
+
+Without --scheme/--rounds the helper follows the hash already on disk: `verify` leaves a
+current hash alone and `set` keeps its scheme and cost. The Python edition owns the policy
+(PASSWORD_SCHEME, calibrated cost), so the two editions never undo each other's rehash.
+
+Usage (the password is read from stdin, never from the command line):
+    python zehrasec_passwd.py verify <pass_file> [--scheme bcrypt|scrypt] [--rounds N]
+    python zehrasec_passwd.py set <pass_file> [--scheme bcrypt|scrypt] [--rounds N]
+
+Exit status: 0 verified/saved, 1 wrong password, 2 error (reason on stderr).
+"""
+
+import os
+import re
+import sys
+import hmac
+import base64
+import hashlib
+import tempfile
+import contextlib
+from pathlib import Path
+from typing import Optional
+
+PREFIX = "$zs1$"
+SCHEMES = ("bcrypt", "scrypt")
+BCRYPT_DEFAULT_ROUNDS = 12
+SCRYPT_PARAMS = {"n": 2 ** 14, "r": 8, "p": 1}
+SCRYPT_KEY_BYTES = 32
+
+_SHA256_RE = re.compile(r"[0-9a-f]{64}")
+_BCRYPT_RE = re.compile(r"\$2[abxy]?\$(\d{2})\$[./A-Za-z0-9]{53}")
+
+def bcrypt_available() -> bool:
+    try:
+        import bcrypt  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+def _bcrypt():
+    try:
+        import bcrypt
+    except ImportError:
+        raise ImportError(f"bcrypt unavailable for {sys.executable} (pip install bcrypt)") from None
+    return bcrypt
+
+def default_scheme() -> str:
+    return "bcrypt" if bcrypt_available() else "scrypt"
+
+def identify(stored: str) -> str:
+    """'bcrypt' or 'scrypt' for current hashes, 'legacy-bcrypt' or 'legacy-sha256' for old ones"""
+    if stored.startswith(PREFIX + "bcrypt$"):
+        return "bcrypt"
+    if stored.startswith(PREFIX + "scrypt$"):
+        return "scrypt"
+    if _BCRYPT_RE.fullmatch(stored):
+        return "legacy-bcrypt"
+    if _SHA256_RE.fullmatch(stored):
+        return "legacy-sha256"
+    return "unknown"
+
+def bcrypt_cost(stored: str) -> Optional[int]:
+    """Cost factor of a bcrypt hash, wrapped or bare"""
+    match = _BCRYPT_RE.search(stored)
+    return int(match.group(1)) if match else None
+
+def describe(stored: str) -> str:
+    """Short human description such as 'bcrypt cost 12' or 'legacy-sha256'"""
+    kind = identify(stored)
+    cost = bcrypt_cost(stored) if kind in ("bcrypt", "legacy-bcrypt") else None
+    return f"{kind} cost {cost}" if cost is not None else kind
+
+def _b64(data: bytes) -> str:
+    return base64.b64encode(data).decode("ascii").rstrip("=")
+
+def _unb64(text: str) -> bytes:
+    return base64.b64decode(text + "=" * (-len(text) % 4))
+
+def _scrypt(password: str, salt: bytes, n: int, r: int, p: int) -> bytes:
+    return hashlib.scrypt(password.encode("utf-8"), salt=salt, n=n, r=r, p=p,
+                          maxmem=128 * n * r * 2, dklen=SCRYPT_KEY_BYTES)
+
+def hash_password(password: str, scheme: Optional[str] = None, rounds: Optional[int] = None) -> str:
+    """Hash a password in the current format; rounds is the bcrypt cost"""
+    scheme = scheme or default_scheme()
+    if scheme == "bcrypt":
+        bcrypt = _bcrypt()
+        salt = bcrypt.gensalt(rounds=rounds or BCRYPT_DEFAULT_ROUNDS)
+        return PREFIX + "bcrypt$" + bcrypt.hashpw(password.encode("utf-8"), salt).decode("ascii")
+    if scheme == "scrypt":
+        salt = os.urandom(16)
+        params = SCRYPT_PARAMS
+        key = _scrypt(password, salt, **params)
+        return f"{PREFIX}scrypt$n={params['n']},r={params['r']},p={params['p']}${_b64(salt)}${_b64(key)}"
+    raise ValueError(f"Unknown password scheme: {scheme}")
+
+def verify_password(password: str, stored: str) -> bool:
+    """Check a password against any supported hash, in constant time where the scheme allows
+    
+    Raises ImportError when the hash needs bcrypt and it is not installed.
+    """
+    kind = identify(stored)
+    if kind in ("bcrypt", "legacy-bcrypt"):
+        bcrypt = _bcrypt()
+    try:
+        if kind in ("bcrypt", "legacy-bcrypt"):
+            hashed = stored[len(PREFIX + "bcrypt$"):] if kind == "bcrypt" else stored
+            return bcrypt.checkpw(password.encode("utf-8"), hashed.encode("ascii"))
+        if kind == "scrypt":
+            _, _, _, params, salt, key = stored.split("$")
+            values = dict(item.split("=", 1) for item in params.split(","))
+            expected = _unb64(key)
+            actual = _scrypt(password, _unb64(salt), int(values["n"]), int(values["r"]), int(values["p"]))
+            return hmac.compare_digest(actual, expected)
+        if kind == "legacy-sha256":
+            digest = hashlib.sha256(password.encode("utf-8")).hexdigest()
+            return hmac.compare_digest(digest, stored)
+    except (ValueError, KeyError, TypeError):
+        return False
+    return False
+
+def needs_update(stored: str, scheme: Optional[str] = None, rounds: Optional[int] = None) -> bool:
+    """True when the hash is legacy, uses another scheme, or is weaker than the target parameters"""
+    scheme = scheme or default_scheme()
+    kind = identify(stored)
+    if kind != scheme:
+        return True
+    if kind == "bcrypt":
+        return (bcrypt_cost(stored) or 0) < (rounds or BCRYPT_DEFAULT_ROUNDS)
+    params = ",".join(f"{name}={value}" for name, value in SCRYPT_PARAMS.items())
+    return stored.split("$")[3] != params
+
+def current_policy(stored: str):
+    """(scheme, rounds) of a current-format hash, or (None, None) for legacy and unknown ones"""
+    kind = identify(stored)
+    if kind not in SCHEMES:
+        return None, None
+    return kind, bcrypt_cost(stored) if kind == "bcrypt" else None
+
+def read_hash(pass_file: Path) -> str:
+    return pass_file.read_text(encoding="utf-8").strip()
+
+def write_hash(pass_file: Path, hashed: str):
+    """Atomically replace the password file, readable only by its owner"""
+    fd, tmp_name = tempfile.mkstemp(prefix=pass_file.name + ".", suffix=".tmp", dir=pass_file.parent)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(hashed)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_name, 0o600)
+        os.replace(tmp_name, pass_file)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp_name)
+        raise
+
+def _read_password() -> str:
+    line = sys.stdin.readline()
+    return line[:-1] if line.endswith("\n") else line
+
+def main() -> int:
+    import argparse
+    parser = argparse.ArgumentParser(description="ZehraSec Terminal password hashes (password on stdin)")
+    parser.add_argument("action", choices=["verify", "set"])
+    parser.add_argument("pass_file", type=Path)
+    parser.add_argument("--scheme", choices=SCHEMES, default=None)
+    parser.add_argument("--rounds", type=int, default=None, help="bcrypt cost for new hashes")
+    args = parser.parse_args()
+    
+    password = _read_password()
+    explicit = args.scheme is not None or args.rounds is not None
+    try:
+        if args.action == "set":
+            scheme, rounds = args.scheme, args.rounds
+            if not explicit and args.pass_file.exists():
+                scheme, rounds = current_policy(read_hash(args.pass_file))
+            write_hash(args.pass_file, hash_password(password, scheme, rounds))
+            return 0
+        
+        stored = read_hash(args.pass_file)
+        if not verify_password(password, stored):
+            return 1
+        if explicit or current_policy(stored)[0] is None:
+            if needs_update(stored, args.scheme, args.rounds):
+                write_hash(args.pass_file, hash_password(password, args.scheme, args.rounds))
+        return 0
+    except (OSError, ValueError, ImportError) as e:
+        print(f"zehrasec_passwd: {e}", file=sys.stderr)
+        return 2
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -13,27 +13,44 @@ and enhanced security features created by Yashab Alam, the visionary founder of
 import os
 import sys
 import time
+
+# Reference point for --profile-startup
+_STARTUP_T0 = time.perf_counter()
+
 import random
 import hashlib
+import hmac
+import secrets
 import getpass
 import datetime
 import threading
 import json
 import platform
 import subprocess
+import shutil
+import signal
+import select
+import bisect
+import re
+import copy
+import atexit
+import heapq
+import itertools
+import fnmatch
+import contextlib
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 import logging
+import logging.handlers
+import queue
+import importlib
+import importlib.util
+from collections import OrderedDict, deque
+
+import zehrasec_passwd
 
 try:
     from colorama import init, Fore, Back, Style
-    from rich.console import Console
-    from rich.table import Table
-    from rich.panel import Panel
-    from rich.progress import Progress, SpinnerColumn, TextColumn
-    import pyfiglet
-    import psutil
-    import bcrypt
 except ImportError as e:
     print(f"Error: Missing required packages. Please run: pip install -r requirements.txt")
     print(f"Specific error: {e}")
@@ -42,28 +59,712 @@ except ImportError as e:
 # Initialize colorama for Windows compatibility
 init(autoreset=True)
 
+class LazyModule:
+    """Module proxy that performs the real import on first attribute access"""
+    
+    load_times: Dict[str, float] = {}
+    
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+        
+    def _load(self):
+        if self._module is None:
+            start = time.perf_counter()
+            self._module = importlib.import_module(self._name)
+            LazyModule.load_times[self._name] = time.perf_counter() - start
+        return self._module
+    
+    def __getattr__(self, attr: str):
+        return getattr(self._load(), attr)
+
+# Heavy dependencies are only imported when a command first needs them
+rich_console = LazyModule("rich.console")
+rich_table = LazyModule("rich.table")
+psutil = LazyModule("psutil")
+bcrypt = LazyModule("bcrypt")
+asyncio = LazyModule("asyncio")
+
+# Optional: vectorized matrix rain
+numpy = LazyModule("numpy")
+
+REQUIRED_MODULES = ["rich", "psutil", "bcrypt"]
+
+def missing_modules() -> List[str]:
+    """Return required packages that cannot be found, without importing them"""
+    return [name for name in REQUIRED_MODULES if importlib.util.find_spec(name) is None]
+
+def clear_screen():
+    """Clear the terminal with ANSI escapes instead of spawning clear/cls"""
+    sys.stdout.write("\033[2J\033[H")
+    sys.stdout.flush()
+
+class StartupProfiler:
+    """Record startup phase timings for --profile-startup"""
+    
+    TARGET_MS = 100
+    
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._last = _STARTUP_T0
+        self.phases: List[Tuple[str, float]] = []
+        
+    def mark(self, phase: str):
+        """Close the current phase under the given name"""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.phases.append((phase, now - self._last))
+        self._last = now
+    
+    def report(self):
+        """Print the phase breakdown and lazily imported modules to stderr"""
+        if not self.enabled:
+            return
+        total_ms = (time.perf_counter() - _STARTUP_T0) * 1000
+        out = sys.stderr
+        out.write(f"{Fore.CYAN}⏱️  Startup profile (to password prompt){Style.RESET_ALL}\n")
+        for phase, elapsed in self.phases:
+            out.write(f"  {phase:<24} {elapsed * 1000:8.2f} ms\n")
+        for name, elapsed in LazyModule.load_times.items():
+            out.write(f"  {'lazy import ' + name:<24} {elapsed * 1000:8.2f} ms\n")
+        color = Fore.GREEN if total_ms <= self.TARGET_MS else Fore.RED
+        out.write(f"  {'total':<24} {color}{total_ms:8.2f} ms{Style.RESET_ALL} (target {self.TARGET_MS} ms)\n")
+        out.flush()
+
+class StateStore:
+    """Mutable terminal state kept in memory and written behind to one JSON file"""
+    
+    VERSION = 1
+    
+    def __init__(self, path: Path, legacy_dir: Optional[Path] = None, flush_interval: float = 2.0):
+        self.path = path
+        self.legacy_dir = legacy_dir
+        self.flush_interval = flush_interval
+        self.writes = 0
+        self._data = None
+        self._dirty = False
+        self._timer = None
+        self._lock = threading.RLock()
+        
+    def _load(self) -> Dict:
+        if self._data is not None:
+            return self._data
+        with self._lock:
+            if self._data is not None:
+                return self._data
+            try:
+                data = json.loads(self.path.read_text(encoding='utf-8'))
+                if not isinstance(data, dict):
+                    raise ValueError("state is not an object")
+            except FileNotFoundError:
+                data = self._migrate()
+                self._dirty = bool(data)
+            except (OSError, ValueError) as e:
+                logging.warning(f"Ignoring unreadable state file {self.path}: {e}")
+                data = {}
+            data["version"] = self.VERSION
+            self._data = data
+            atexit.register(self.close)
+            if self._dirty:
+                self.flush()
+        return self._data
+    
+    def _migrate(self) -> Dict:
+        """Import the one-file-per-setting layout used before state.json"""
+        data = {}
+        if self.legacy_dir is None:
+            return data
+        
+        def read(name: str) -> Optional[str]:
+            try:
+                return (self.legacy_dir / name).read_text(encoding='utf-8').strip()
+            except (OSError, UnicodeDecodeError):
+                return None
+        
+        fails = read("fails")
+        if fails and fails.isdigit():
+            data["failed_attempts"] = int(fails)
+        locktime = read("locktime")
+        try:
+            if locktime:
+                data["lock_until"] = float(locktime)
+        except ValueError:
+            pass
+        prompt = read("prompt")
+        if prompt:
+            data["prompt"] = prompt
+        for key, name in (("banner", "banner"), ("session", "session")):
+            value = read(name)
+            try:
+                if value:
+                    data[key] = json.loads(value)
+            except ValueError:
+                pass
+        preferences = read("preferences")
+        if preferences:
+            data["preferences"] = dict(line.split("=", 1) for line in preferences.splitlines() if "=" in line)
+        
+        if data:
+            logging.info(f"Migrated {', '.join(sorted(data))} into {self.path.name}")
+        return data
+    
+    def get(self, key: str, default=None):
+        """Return a state value from memory"""
+        return self._load().get(key, default)
+    
+    def set(self, key: str, value):
+        """Change a state value; it reaches disk on the next flush"""
+        with self._lock:
+            self._load()[key] = value
+            self._mark_dirty()
+    
+    def delete(self, key: str):
+        """Remove a state value if present"""
+        with self._lock:
+            if self._load().pop(key, None) is not None:
+                self._mark_dirty()
+    
+    def _mark_dirty(self):
+        self._dirty = True
+        if self._timer is None and self.flush_interval > 0:
+            self._timer = threading.Timer(self.flush_interval, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+    
+    def flush(self):
+        """Atomically replace the state file if anything changed"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._dirty or self._data is None:
+                return
+            data = json.dumps(self._data, indent=2, sort_keys=True)
+            tmp_file = self.path.with_suffix(".tmp")
+            try:
+                tmp_file.write_text(data, encoding='utf-8')
+                os.replace(tmp_file, self.path)
+            except OSError as e:
+                logging.warning(f"Unable to write state file {self.path}: {e}")
+                return
+            self._dirty = False
+            self.writes += 1
+    
+    def close(self):
+        """Flush pending changes and stop the write-behind timer"""
+        self.flush()
+
+@contextlib.contextmanager
+def locked_fd(fd: int, exclusive: bool = True):
+    """Hold an advisory lock on an open lock file: flock on POSIX, a byte lock on Windows"""
+    if platform.system() == "Windows":
+        import msvcrt
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+    else:
+        import fcntl
+        fcntl.flock(fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+
+class JsonLinesFormatter(logging.Formatter):
+    """Audit records as one JSON object per line: time, level, event, session, latency, message"""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.datetime.fromtimestamp(record.created).astimezone().isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "event": getattr(record, "event", "message"),
+        }
+        session = getattr(record, "session", None)
+        if session:
+            entry["session"] = session
+        entry.update(getattr(record, "fields", None) or {})
+        entry["message"] = record.getMessage()
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        if record.stack_info:
+            entry["stack"] = record.stack_info
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+class AuditQueueHandler(logging.handlers.QueueHandler):
+    """Queues records for the listener thread without flattening them into text
+    
+    The stock prepare() folds the traceback into the message and drops exc_info; here the
+    traceback is rendered into exc_text so JsonLinesFormatter can store it as its own field.
+    """
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.message = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = record.exc_text or logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+class AuditContextFilter(logging.Filter):
+    """Stamps records with the current session id"""
+    
+    def __init__(self, context: Dict):
+        super().__init__()
+        self.context = context
+        
+    def filter(self, record: logging.LogRecord) -> bool:
+        if getattr(record, "session", None) is None:
+            record.session = self.context.get("session")
+        return True
+
+class AuditLogHandler(logging.handlers.BaseRotatingHandler):
+    """access.log rotated by size and at midnight; closed segments are gzip-compressed and pruned
+    
+    Segments are named access.log.<YYYY-MM-DD>.<n>.gz after the day they cover.
+    
+    Every terminal process appends to the same file, so each write happens under a lock on
+    access.log.lock. A writer that finds access.log replaced since it opened it reopens it
+    instead of rotating again, and a rotation renames the live file aside (compressing it after
+    the lock is released), so no process is left writing to a deleted file.
+    """
+    
+    SEGMENT_RE = r"\.(\d{4}-\d{2}-\d{2})\.(\d+)\.gz$"
+    PENDING_RE = r"\.(\d{4}-\d{2}-\d{2})\.(\d+)$"  # renamed aside, not yet compressed
+    
+    def __init__(self, filename: Path, max_bytes: int = 0, backup_count: int = 0, retention_days: int = 0):
+        super().__init__(str(filename), "a", encoding="utf-8")
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.retention_days = retention_days
+        self.segment_day = self._file_day()
+        self._legacy = self._is_legacy()  # plain-text log from before JSON lines: rotate it away first
+        self._lock_fd = os.open(self.baseFilename + ".lock", os.O_RDWR | os.O_CREAT, 0o600)
+        self._rotated: List[Path] = []  # renamed aside by this process, waiting to be compressed
+        
+    def _file_day(self) -> datetime.date:
+        try:
+            return datetime.date.fromtimestamp(os.stat(self.baseFilename).st_mtime)
+        except OSError:
+            return datetime.date.today()
+    
+    def _is_legacy(self) -> bool:
+        try:
+            with open(self.baseFilename, "rb") as f:
+                first = f.read(1)
+        except OSError:
+            return False
+        return bool(first) and first != b"{"
+    
+    @classmethod
+    def segments(cls, log_file: Path, pending: bool = False) -> List[Tuple[datetime.date, int, Path]]:
+        """Compressed segments of log_file, oldest first; with pending, those not yet compressed"""
+        pattern = re.compile(re.escape(log_file.name) + (cls.PENDING_RE if pending else cls.SEGMENT_RE))
+        found = []
+        try:
+            entries = list(os.scandir(log_file.parent))
+        except OSError:
+            return found
+        for entry in entries:
+            match = pattern.match(entry.name)
+            if match:
+                found.append((datetime.date.fromisoformat(match.group(1)), int(match.group(2)), Path(entry.path)))
+        return sorted(found)
+    
+    def emit(self, record: logging.LogRecord):
+        try:
+            with locked_fd(self._lock_fd):
+                self._follow()
+                if self.shouldRollover(record):
+                    self.doRollover()
+                logging.FileHandler.emit(self, record)
+            self._compress_rotated()
+        except Exception:
+            self.handleError(record)
+    
+    def _follow(self):
+        """Reopen access.log if another process rotated it since this one opened it"""
+        if self.stream is None:
+            return
+        try:
+            moved = not os.path.samestat(os.stat(self.baseFilename), os.fstat(self.stream.fileno()))
+        except FileNotFoundError:
+            moved = True
+        if moved:
+            self.stream.close()
+            self.stream = self._open()
+            self.segment_day = self._file_day()
+            self._legacy = self._is_legacy()
+    
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        if self.stream is None:
+            self.stream = self._open()
+        size = os.fstat(self.stream.fileno()).st_size  # includes other processes' writes
+        if self._legacy:
+            return True
+        if size and datetime.date.fromtimestamp(record.created) != self.segment_day:
+            return True
+        return self.max_bytes > 0 and size >= self.max_bytes
+    
+    def doRollover(self):
+        """Rename access.log aside and start a new one; called with access.log.lock held"""
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+        
+        source = Path(self.baseFilename)
+        try:
+            if source.stat().st_size:
+                day = self.segment_day
+                taken = {n for d, n, _ in self.segments(source) if d == day}
+                taken.update(n for d, n, _ in self.segments(source, pending=True) if d == day)
+                target = source.with_name(f"{source.name}.{day.isoformat()}.{max(taken, default=0) + 1}")
+                os.rename(source, target)
+                self._rotated.append(target)
+        except OSError as e:
+            sys.stderr.write(f"ZehraSec: unable to rotate {source}: {e}\n")
+        
+        self._legacy = False
+        self.segment_day = datetime.date.today()
+        self.stream = self._open()
+    
+    def _compress_rotated(self):
+        """gzip the segments this process renamed aside, then apply retention"""
+        import gzip
+        if not self._rotated:
+            return
+        source = Path(self.baseFilename)
+        while self._rotated:
+            path = self._rotated.pop()
+            tmp_path = path.with_name(path.name + ".gz.tmp")
+            try:
+                with open(path, "rb") as src, gzip.open(tmp_path, "wb") as dst:
+                    shutil.copyfileobj(src, dst)
+                os.replace(tmp_path, path.with_name(path.name + ".gz"))
+                path.unlink()
+            except OSError as e:
+                sys.stderr.write(f"ZehraSec: unable to compress {path}: {e}\n")
+        self._prune(source)
+    
+    def close(self):
+        super().close()
+        self._compress_rotated()
+        if self._lock_fd is not None:
+            os.close(self._lock_fd)
+            self._lock_fd = None
+    
+    def _prune(self, source: Path):
+        """Apply LOG_RETENTION_DAYS and LOG_BACKUP_COUNT to the compressed segments"""
+        segments = self.segments(source)
+        expired = []
+        if self.retention_days > 0:
+            cutoff = datetime.date.today() - datetime.timedelta(days=self.retention_days)
+            expired = [segment for segment in segments if segment[0] < cutoff]
+            segments = [segment for segment in segments if segment[0] >= cutoff]
+        if self.backup_count > 0 and len(segments) > self.backup_count:
+            expired += segments[:len(segments) - self.backup_count]
+        for _, _, path in expired:
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+class AuditLogIndex:
+    """Sidecar index of the audit log: byte offsets by day, event and level for access.log,
+    and an event/level/time summary per compressed segment, updated incrementally"""
+    
+    VERSION = 1
+    LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")
+    
+    def __init__(self, log_file: Path, index_file: Path):
+        self.log_file = log_file
+        self.index_file = index_file
+        self.lines_indexed = 0
+        self._data = self._load()
+        
+    def _empty(self) -> Dict:
+        return {"version": self.VERSION, "live": self._empty_live(None), "segments": {}}
+    
+    @staticmethod
+    def _empty_live(inode: Optional[int]) -> Dict:
+        return {"inode": inode, "size": 0, "days": {}, "events": {}, "levels": {}}
+    
+    def _load(self) -> Dict:
+        """Load the index, discarding it if it is unreadable or from another version"""
+        try:
+            data = json.loads(self.index_file.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return self._empty()
+        
+        if (not isinstance(data, dict) or data.get("version") != self.VERSION
+                or not isinstance(data.get("live"), dict) or not isinstance(data.get("segments"), dict)):
+            return self._empty()
+        return data
+    
+    def _save(self):
+        """Atomically replace the on-disk index"""
+        tmp_file = self.index_file.with_suffix(".tmp")
+        try:
+            tmp_file.write_text(json.dumps(self._data, separators=(',', ':')), encoding='utf-8')
+            os.replace(tmp_file, self.index_file)
+        except OSError:
+            pass
+    
+    @staticmethod
+    def parse_record(line: bytes) -> Optional[Dict]:
+        try:
+            record = json.loads(line)
+        except ValueError:
+            return None
+        return record if isinstance(record, dict) else None
+    
+    @staticmethod
+    def record_time(record: Dict) -> Optional[datetime.datetime]:
+        """Timestamp of a record; the bash edition writes +HHMM offsets, Python +HH:MM"""
+        ts = str(record.get("ts", ""))
+        if re.search(r"[+-]\d{4}$", ts):
+            ts = f"{ts[:-2]}:{ts[-2:]}"
+        try:
+            when = datetime.datetime.fromisoformat(ts)
+        except ValueError:
+            return None
+        return when if when.tzinfo else when.astimezone()
+    
+    def refresh(self) -> bool:
+        """Index new segments and the unindexed tail of access.log, returning True if anything changed"""
+        changed = self._refresh_segments()
+        changed |= self._refresh_live()
+        if changed:
+            self._save()
+        return changed
+    
+    def _refresh_segments(self) -> bool:
+        summaries = self._data["segments"]
+        present = {path.name: path for _, _, path in AuditLogHandler.segments(self.log_file)}
+        changed = False
+        for name in list(summaries):
+            if name not in present:
+                del summaries[name]
+                changed = True
+        for name, path in present.items():
+            if name not in summaries:
+                summaries[name] = self._summarize(path)
+                changed = True
+        return changed
+    
+    def _summarize(self, path: Path) -> Dict:
+        """Events, levels and time span of a compressed segment, read once when it first appears"""
+        import gzip
+        summary = {"first": None, "last": None, "events": {}, "levels": {}}
+        try:
+            with gzip.open(path, "rb") as f:
+                for line in f:
+                    record = self.parse_record(line)
+                    if record is None:
+                        continue
+                    self.lines_indexed += 1
+                    ts = str(record.get("ts", ""))
+                    summary["first"] = summary["first"] or ts
+                    summary["last"] = ts
+                    event = str(record.get("event", "message"))
+                    level = str(record.get("level", "INFO"))
+                    summary["events"][event] = summary["events"].get(event, 0) + 1
+                    summary["levels"][level] = summary["levels"].get(level, 0) + 1
+        except (OSError, EOFError) as e:
+            logging.warning(f"Unable to index audit segment {path.name}: {e}")
+        return summary
+    
+    def _refresh_live(self) -> bool:
+        live = self._data["live"]
+        try:
+            st = os.stat(self.log_file)
+        except OSError:
+            if live["size"]:
+                self._data["live"] = self._empty_live(None)
+                return True
+            return False
+        
+        # A rotated or truncated file starts over
+        changed = False
+        if live["inode"] != st.st_ino or st.st_size < live["size"]:
+            live = self._data["live"] = self._empty_live(st.st_ino)
+            changed = True
+        if st.st_size == live["size"]:
+            return changed
+        
+        offset = live["size"]
+        with open(self.log_file, "rb") as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # the writer is mid-record; index it next time
+                record = self.parse_record(line)
+                if record is not None:
+                    self.lines_indexed += 1
+                    live["days"].setdefault(str(record.get("ts", ""))[:10], offset)
+                    live["events"].setdefault(str(record.get("event", "message")), []).append(offset)
+                    live["levels"].setdefault(str(record.get("level", "INFO")), []).append(offset)
+                offset += len(line)
+        changed |= offset != live["size"]
+        live["size"] = offset
+        return changed
+    
+    @staticmethod
+    def parse_time(text: str) -> datetime.datetime:
+        """'30m', '2h' or '7d' ago, 'today', or an ISO date/time, as a local aware datetime"""
+        now = datetime.datetime.now().astimezone()
+        match = re.fullmatch(r"(\d+)([smhd])", text)
+        if match:
+            unit = {"s": "seconds", "m": "minutes", "h": "hours", "d": "days"}[match.group(2)]
+            return now - datetime.timedelta(**{unit: int(match.group(1))})
+        if text == "today":
+            return now.replace(hour=0, minute=0, second=0, microsecond=0)
+        when = datetime.datetime.fromisoformat(text)
+        return when if when.tzinfo else when.astimezone()
+    
+    def levels_from(self, level: str) -> List[str]:
+        """The given level and everything more severe"""
+        return list(self.LEVELS[self.LEVELS.index(level.upper()):])
+    
+    def query(self, since: Optional[datetime.datetime] = None, until: Optional[datetime.datetime] = None,
+              levels: Optional[List[str]] = None, events: Optional[List[str]] = None,
+              limit: int = 50, cancel_event: Optional[threading.Event] = None) -> List[Dict]:
+        """The newest `limit` records matching every given filter, oldest first
+        
+        events are fnmatch patterns such as 'login_*'. Only access.log offsets listed under the
+        wanted events, levels and days are read; compressed segments whose summary cannot match
+        are never opened. Setting cancel_event stops the scan with the matches found so far.
+        """
+        self.refresh()
+        
+        def wanted(record: Dict) -> bool:
+            if levels and record.get("level") not in levels:
+                return False
+            if events and not any(fnmatch.fnmatchcase(str(record.get("event", "")), p) for p in events):
+                return False
+            if since or until:
+                when = self.record_time(record)
+                if when is None or (since and when < since) or (until and when > until):
+                    return False
+            return True
+        
+        matches = []
+        for record in itertools.chain(self._live_candidates(since, until, levels, events),
+                                      self._segment_candidates(since, until, levels, events)):
+            if cancel_event is not None and cancel_event.is_set():
+                break
+            if wanted(record):
+                matches.append(record)
+                if len(matches) >= limit:
+                    break
+        matches.reverse()
+        return matches
+    
+    def _matching(self, names, patterns: Optional[List[str]]) -> List[str]:
+        if not patterns:
+            return list(names)
+        return [name for name in names if any(fnmatch.fnmatchcase(name, p) for p in patterns)]
+    
+    def _live_candidates(self, since, until, levels, events):
+        """Records from access.log that the index says may match, newest first"""
+        live = self._data["live"]
+        by_event = set()
+        for event in self._matching(live["events"], events):
+            by_event.update(live["events"][event])
+        if levels:
+            by_level = set()
+            for level in levels:
+                by_level.update(live["levels"].get(level, ()))
+            by_event &= by_level
+        
+        # Days are appended in order, so their first offsets bound the byte range to read
+        days = sorted(live["days"].items(), key=lambda item: item[1])
+        low, high = 0, live["size"]
+        if since:
+            later = [offset for day, offset in days if day >= since.date().isoformat()]
+            low = later[0] if later else high
+        if until:
+            after = [offset for day, offset in days if day > until.date().isoformat()]
+            high = after[0] if after else high
+        offsets = sorted((o for o in by_event if low <= o < high), reverse=True)
+        if not offsets:
+            return
+        
+        try:
+            f = open(self.log_file, "rb")
+        except OSError:
+            return
+        with f:
+            for offset in offsets:
+                f.seek(offset)
+                record = self.parse_record(f.readline())
+                if record is not None:
+                    yield record
+    
+    def _segment_candidates(self, since, until, levels, events):
+        """Records from compressed segments whose summary may match, newest first"""
+        import gzip
+        for _, _, path in reversed(AuditLogHandler.segments(self.log_file)):
+            summary = self._data["segments"].get(path.name)
+            if summary is None or summary["first"] is None:
+                continue
+            if events and not self._matching(summary["events"], events):
+                continue
+            if levels and not set(levels) & set(summary["levels"]):
+                continue
+            if since and summary["last"][:10] < since.date().isoformat():
+                continue
+            if until and summary["first"][:10] > until.date().isoformat():
+                continue
+            try:
+                with gzip.open(path, "rb") as f:
+                    lines = f.readlines()
+            except (OSError, EOFError):
+                continue
+            for line in reversed(lines):
+                record = self.parse_record(line)
+                if record is not None:
+                    yield record
+
 class ZehraSecConfig:
     """Configuration management for ZehraSec Terminal"""
     
+    _log_listener = None  # one audit log writer per process
+    
     def __init__(self):
         self.config_dir = Path.home() / ".zehrasec"
         self.config_dir.mkdir(exist_ok=True)
         
         # Configuration files
         self.pass_file = self.config_dir / "pass"
-        self.fails_file = self.config_dir / "fails"
-        self.locktime_file = self.config_dir / "locktime"
         self.log_file = self.config_dir / "access.log"
-        self.session_file = self.config_dir / "session"
-        self.prompt_file = self.config_dir / "prompt"
-        self.banner_file = self.config_dir / "banner"
-        self.preferences_file = self.config_dir / "preferences"
+        self.audit_index_file = self.config_dir / "access.log.idx"
+        self.settings_file = self.config_dir / "config"
+        self.catalog_file = self.config_dir / "art_catalog.json"
+        self.state_file = self.config_dir / "state.json"  # session, prompt, banner
+        self.attempts_file = self.config_dir / "attempts.json"  # failed logins, shared between processes
+        self.sessions_dir = self.config_dir / "sessions"  # one <id>.json per live session
+        self.session_key_file = self.config_dir / "session.key"  # HMAC key signing session files
         
         # Security settings
         self.MAX_FAIL_ATTEMPTS = 3
-        self.LOCKOUT_DURATION = 300  # 5 minutes
+        self.LOCKOUT_DURATION = 300  # 5 minutes, doubled for each lockout since the last good login
+        self.LOCKOUT_MAX_DURATION = 86400  # backoff ceiling
+        self.RATE_LIMIT_WINDOW = 900  # MAX_FAIL_ATTEMPTS failures within this many seconds lock the account
         self.MIN_PASSWORD_LENGTH = 6
         self.SESSION_TIMEOUT = 3600  # 1 hour
+        self.SESSION_PERSIST_INTERVAL = 30  # seconds between saves of session activity
+        self.SESSION_HEARTBEAT_INTERVAL = 15  # seconds between liveness updates in the session registry
+        self.PASSWORD_SCHEME = "bcrypt"  # bcrypt or scrypt, stored in the format shared with .terminal.sh
+        self.BCRYPT_ROUNDS = 0  # bcrypt cost; 0 uses the calibratehash result, else bcrypt's default
+        self.HASH_TARGET_MS = 250  # calibratehash picks the highest cost hashing within this time
         
         # Customization settings
         self.DEFAULT_PROMPT = "ZehraSec"
@@ -77,77 +778,830 @@ class ZehraSecConfig:
             "terminalskullasciiart", "fuckoff", "custom"
         ]
         
+        # Performance settings
+        self.SEED_ASCII_ART_ONCE = True
+        self.CACHE_ASCII_ART = True
+        self.ASCII_CACHE_MAX_ENTRIES = 32
+        self.ASCII_CACHE_MAX_BYTES = 1024 * 1024  # 1 MiB
+        self.STATE_FLUSH_INTERVAL = 2.0  # seconds changes may wait before state.json is rewritten
+        
+        # Audit log settings
+        self.LOG_MAX_BYTES = 5 * 1024 * 1024  # rotate access.log at 5 MiB or at midnight
+        self.LOG_BACKUP_COUNT = 30  # compressed segments kept
+        self.LOG_RETENTION_DAYS = 90  # segments older than this are deleted
+        
+        # Random banner settings
+        self.RANDOM_BANNER_WEIGHTS = ""  # e.g. "custom:3,fuckoff:0"
+        self.RANDOM_BANNER_RECENT = 5
+        self.RANDOM_BANNER_SEED = -1  # -1 disables seeding
+        
+        # Visual settings
+        self.STATUS_TICKER = True  # idle timeout and clock in the terminal title
+        self.STATUS_TICKER_INTERVAL = 1.0
+        self.STATUS_WATCH_INTERVAL = 1.0  # refresh period of status --watch
+        self.TOP_INTERVAL = 2.0  # refresh period of top
+        self.ENABLE_ANIMATIONS = True
+        self.TYPING_SPEED = 0.02  # seconds per character
+        self.MATRIX_DURATION = 3
+        self.MATRIX_FPS = 20
+        self.MATRIX_SHOW_STATS = True
+        self.MATRIX_ENGINE = "python"  # python, numpy or auto (numpy when installed)
+        self.MATRIX_RENDER = "diff"  # diff redraws changed cells only, full redraws every frame
+        
+        self._load_settings()
+        self.state = StateStore(self.state_file, self.config_dir, self.STATE_FLUSH_INTERVAL)
+        
         # Setup logging
-        logging.basicConfig(
-            filename=self.log_file,
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s'
-        )
+        self.audit_context = {"session": None}
+        self._setup_logging()
+        
+    def _load_settings(self):
+        """Override defaults with KEY=VALUE pairs from the user config file"""
+        if not self.settings_file.exists():
+            return
+        
+        try:
+            lines = self.settings_file.read_text(encoding='utf-8').splitlines()
+        except (OSError, UnicodeDecodeError):
+            return
+        
+        for line in lines:
+            line = line.strip()
+            if not line or line.startswith('#') or '=' not in line:
+                continue
+            key, value = (part.strip() for part in line.split('=', 1))
+            if not key.isupper() or not hasattr(self, key):
+                continue
+            
+            default = getattr(self, key)
+            try:
+                if isinstance(default, bool):
+                    setattr(self, key, value.lower() in ('1', 'true', 'yes', 'on'))
+                elif isinstance(default, int):
+                    setattr(self, key, int(value))
+                elif isinstance(default, float):
+                    setattr(self, key, float(value))
+                elif isinstance(default, str):
+                    setattr(self, key, value)
+            except ValueError:
+                continue
+    
+    def _setup_logging(self):
+        """Send log records through a queue to the audit log, written by a listener thread"""
+        root = logging.getLogger()
+        if ZehraSecConfig._log_listener is not None:
+            return
+        
+        handler = AuditLogHandler(self.log_file, self.LOG_MAX_BYTES, self.LOG_BACKUP_COUNT, self.LOG_RETENTION_DAYS)
+        handler.setFormatter(JsonLinesFormatter())
+        log_queue = queue.SimpleQueue()
+        queue_handler = AuditQueueHandler(log_queue)
+        queue_handler.addFilter(AuditContextFilter(self.audit_context))
+        root.addHandler(queue_handler)
+        root.setLevel(logging.INFO)
+        
+        listener = logging.handlers.QueueListener(log_queue, handler)
+        listener.start()
+        atexit.register(ZehraSecConfig._stop_logging)
+        ZehraSecConfig._log_listener = listener
+    
+    @staticmethod
+    def _stop_logging():
+        """Drain queued records to disk and stop the listener thread"""
+        listener, ZehraSecConfig._log_listener = ZehraSecConfig._log_listener, None
+        if listener is not None:
+            listener.stop()
+    
+    def log_activity(self, message: str, level: str = "INFO", event: str = "message", exc_info: bool = False,
+                     **fields):
+        """Log activity to the audit log; extra fields (e.g. latency_ms) become JSON keys
+        
+        With exc_info, the exception being handled is stored as the record's "exception" field.
+        """
+        logging.log(logging.getLevelName(level.upper()), message, exc_info=exc_info,
+                    extra={"event": event, "fields": fields})
+
+def cursor_table(width: int, height: int) -> List[List[str]]:
+    """Precompute the ANSI cursor-addressing sequence for every cell of the screen"""
+    return [[f"\033[{row};{col}H" for col in range(1, width + 1)]
+            for row in range(1, height + 1)]
+
+class MatrixRain:
+    """Column-drop state for the matrix rain, kept as a grid of coloured cells"""
+    
+    TRAIL_BRIGHT = 2  # cells behind the head drawn in the bright colour
+    
+    def __init__(self, width: int, height: int, chars: str, head_color: str,
+                 bright_color: str, trail_color: str, density: float = 0.04,
+                 rng: Optional[random.Random] = None):
+        self.chars = chars
+        self.head_color = head_color
+        self.bright_color = bright_color
+        self.trail_color = trail_color
+        self.density = density
+        self.rng = rng or random.Random()
+        self.resize(width, height)
+        
+    def resize(self, width: int, height: int):
+        """Reset the grid and drops for a new terminal size"""
+        self.width = max(1, width)
+        self.height = max(1, height)
+        self.grid = [[" "] * self.width for _ in range(self.height)]
+        self.shown = [[" "] * self.width for _ in range(self.height)]
+        self.cup = cursor_table(self.width, self.height)
+        self.dirty = set()
+        self.heads = [-1] * self.width
+        self.trails = [0] * self.width
+        
+    def step(self):
+        """Advance every drop by one row"""
+        rng = self.rng
+        grid = self.grid
+        dirty = self.dirty
+        height = self.height
+        max_trail = max(4, height // 2)
+        
+        for col in range(self.width):
+            head = self.heads[col]
+            if head < 0:
+                if rng.random() >= self.density:
+                    continue
+                head = 0
+                self.trails[col] = rng.randint(4, max_trail)
+            else:
+                head += 1
+            self.heads[col] = head
+            
+            if head < height:
+                grid[head][col] = self.head_color + rng.choice(self.chars)
+                dirty.add((head, col))
+            row = head - 1
+            if 0 <= row < height:
+                grid[row][col] = self.bright_color + grid[row][col][-1]
+                dirty.add((row, col))
+            row = head - 1 - self.TRAIL_BRIGHT
+            if 0 <= row < height:
+                grid[row][col] = self.trail_color + grid[row][col][-1]
+                dirty.add((row, col))
+            tail = head - self.trails[col]
+            if 0 <= tail < height:
+                grid[tail][col] = " "
+                dirty.add((tail, col))
+            if tail >= height - 1:
+                self.heads[col] = -1
+    
+    def frame(self) -> str:
+        """Return the current grid as a newline separated frame"""
+        self.dirty.clear()
+        self.shown = [row[:] for row in self.grid]
+        return "\n".join(["".join(row) for row in self.grid])
+    
+    def diff(self) -> str:
+        """Return cursor-addressed updates for the cells changed since the last frame"""
+        grid = self.grid
+        shown = self.shown
+        cup = self.cup
+        parts = []
+        for row, col in self.dirty:
+            cell = grid[row][col]
+            if shown[row][col] != cell:
+                shown[row][col] = cell
+                parts.append(cup[row][col] + cell)
+        self.dirty.clear()
+        return "".join(parts)
+
+class NumpyMatrixRain(MatrixRain):
+    """Vectorized matrix rain: drops, glyphs and colours are computed as whole arrays"""
+    
+    def __init__(self, width: int, height: int, chars: str, head_color: str,
+                 bright_color: str, trail_color: str, density: float = 0.04,
+                 seed: Optional[int] = None):
+        self.np_rng = numpy.random.default_rng(seed)
+        tokens = [head_color + ch for ch in chars]
+        tokens += [bright_color + ch for ch in chars]
+        tokens += [trail_color + ch for ch in chars]
+        tokens += [" ", "\n"]
+        self.tokens = numpy.array(tokens, dtype=object)
+        self.blank = len(tokens) - 2
+        self.newline = len(tokens) - 1
+        super().__init__(width, height, chars, head_color, bright_color, trail_color, density)
+        
+    def resize(self, width: int, height: int):
+        """Reset the arrays for a new terminal size"""
+        self.width = max(1, width)
+        self.height = max(1, height)
+        self.heads = numpy.full(self.width, -1, dtype=numpy.int32)
+        self.trails = numpy.zeros(self.width, dtype=numpy.int32)
+        self.glyphs = numpy.zeros((self.height, self.width), dtype=numpy.int32)
+        self.cols = numpy.arange(self.width)
+        self.codes = numpy.full((self.height, self.width), self.blank, dtype=numpy.int32)
+        self.shown = self.codes.copy()
+        self.cup = numpy.array(cursor_table(self.width, self.height), dtype=object)
+        self.newlines = numpy.full((self.height, 1), self.newline, dtype=numpy.int32)
+        
+    def step(self):
+        """Advance every drop by one row"""
+        rng = self.np_rng
+        heads = self.heads
+        codes = self.codes
+        height = self.height
+        nchars = len(self.chars)
+        max_trail = max(4, height // 2)
+        
+        active = heads >= 0
+        heads[active] += 1
+        spawn = ~active & (rng.random(self.width) < self.density)
+        heads[spawn] = 0
+        self.trails[spawn] = rng.integers(4, max_trail + 1, int(spawn.sum()))
+        
+        # Only the cells around each head change: new head glyph, two recoloured
+        # trail cells and the cleared tail, all updated as whole column vectors
+        cols = self.cols[heads >= 0]
+        col_heads = heads[cols]
+        col_tails = col_heads - self.trails[cols]
+        
+        visible = col_heads < height
+        rows, where = col_heads[visible], cols[visible]
+        glyphs = rng.integers(0, nchars, where.size)
+        self.glyphs[rows, where] = glyphs
+        codes[rows, where] = glyphs
+        
+        for offset, level in ((1, 1), (1 + self.TRAIL_BRIGHT, 2)):
+            rows = col_heads - offset
+            visible = (rows >= 0) & (rows < height) & (rows > col_tails)
+            rows, where = rows[visible], cols[visible]
+            codes[rows, where] = level * nchars + self.glyphs[rows, where]
+        
+        visible = (col_tails >= 0) & (col_tails < height)
+        codes[col_tails[visible], cols[visible]] = self.blank
+        
+        heads[heads - self.trails >= height - 1] = -1
+    
+    def frame(self) -> str:
+        """Return the current frame as a newline separated string"""
+        self.shown[...] = self.codes
+        codes = numpy.hstack((self.codes, self.newlines)).ravel()[:-1]
+        return "".join(self.tokens[codes].tolist())
+    
+    def diff(self) -> str:
+        """Return cursor-addressed updates for the cells changed since the last frame"""
+        rows, cols = numpy.nonzero(self.codes != self.shown)
+        if not rows.size:
+            return ""
+        codes = self.codes[rows, cols]
+        self.shown[rows, cols] = codes
+        return "".join((self.cup[rows, cols] + self.tokens[codes]).tolist())
+
+def numpy_available() -> bool:
+    """Return True if the optional NumPy engine can be used"""
+    return importlib.util.find_spec("numpy") is not None
+
+class KeypressWatcher:
+    """Context manager that notices key presses without waiting for Enter"""
+    
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stdin
+        self.fd = None
+        self.saved_attrs = None
+        self.termios = None
+        self.msvcrt = None
+        
+    def __enter__(self):
+        try:
+            if not self.stream.isatty():
+                return self
+        except (AttributeError, ValueError):
+            return self
         
-    def log_activity(self, message: str, level: str = "INFO"):
-        """Log activity to file"""
-        if level.upper() == "ERROR":
-            logging.error(message)
-        elif level.upper() == "WARNING":
-            logging.warning(message)
+        if os.name == "nt":
+            import msvcrt
+            self.msvcrt = msvcrt
         else:
-            logging.info(message)
+            import termios
+            import tty
+            self.termios = termios
+            self.fd = self.stream.fileno()
+            self.saved_attrs = termios.tcgetattr(self.fd)
+            tty.setcbreak(self.fd)
+        return self
+    
+    def wait(self, timeout: float) -> bool:
+        """Wait up to timeout seconds, returning True as soon as a key is pressed"""
+        if self.fd is not None:
+            ready, _, _ = select.select([self.fd], [], [], max(0.0, timeout))
+            if ready:
+                os.read(self.fd, 1024)  # swallow the key so it doesn't reach the prompt
+                return True
+            return False
+        
+        if self.msvcrt is not None:
+            deadline = time.perf_counter() + timeout
+            while True:
+                if self.msvcrt.kbhit():
+                    while self.msvcrt.kbhit():
+                        self.msvcrt.getwch()
+                    return True
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    return False
+                time.sleep(min(0.01, remaining))
+        
+        if timeout > 0:
+            time.sleep(timeout)
+        return False
+    
+    def __exit__(self, exc_type, exc, tb):
+        if self.saved_attrs is not None:
+            self.termios.tcsetattr(self.fd, self.termios.TCSADRAIN, self.saved_attrs)
+            self.saved_attrs = None
+        return False
+
+class TypingEffect:
+    """Typing animation written in time-sliced chunks instead of one write per character"""
+    
+    TOKEN_RE = re.compile(r"\x1b\[[0-9;?]*[A-Za-z]|.", re.DOTALL)
+    MIN_SLICE = 0.05  # at most 20 writes (packets over SSH) per second
+    MAX_SLICE = 0.25
+    LATENCY_FACTOR = 4  # keep each write+flush under a quarter of its slice
+    
+    def __init__(self, out=None):
+        self.out = out
+        self.write_latency = 0.0  # moving average of write+flush time in seconds
+        
+    def slice_length(self, delay: float) -> float:
+        """Seconds between writes: at least one character, longer on slow outputs"""
+        return min(self.MAX_SLICE, max(self.MIN_SLICE, delay, self.write_latency * self.LATENCY_FACTOR))
+    
+    def _write(self, out, chunk: str):
+        start = time.perf_counter()
+        out.write(chunk)
+        out.flush()
+        latency = time.perf_counter() - start
+        self.write_latency = latency if not self.write_latency else 0.8 * self.write_latency + 0.2 * latency
+    
+    def type(self, text: str, delay: float, animate: bool = True) -> bool:
+        """Type text and a newline, returning True if a key press skipped the animation"""
+        out = self.out or sys.stdout
+        try:
+            interactive = out.isatty()
+        except (AttributeError, ValueError):
+            interactive = False
+        if not animate or delay <= 0 or not interactive:
+            out.write(text + "\n")
+            out.flush()
+            return False
+        
+        # Escape sequences are written together with the next character and take no time;
+        # each chunk restarts with the active style in case the stream resets after writes
+        tokens = self.TOKEN_RE.findall(text)
+        visible = []
+        styles = []
+        count = 0
+        style = ""
+        for token in tokens:
+            if len(token) == 1:
+                count += 1
+            elif token.endswith("m"):
+                style = token
+            visible.append(count)
+            styles.append(style)
+        
+        skipped = False
+        pos = 0
+        start = time.perf_counter()
+        with KeypressWatcher() as keys:
+            while pos < len(tokens):
+                due = min(count, int((time.perf_counter() - start) / delay) + 1)
+                end = max(pos + 1, bisect.bisect_right(visible, due))
+                prefix = styles[pos - 1] if pos else ""
+                self._write(out, prefix + "".join(tokens[pos:end]))
+                pos = end
+                if pos < len(tokens) and keys.wait(self.slice_length(delay)):
+                    skipped = True
+                    break
+        if pos < len(tokens):
+            out.write(styles[pos - 1] + "".join(tokens[pos:]))
+        out.write("\n")
+        out.flush()
+        return skipped
 
 class MatrixEffect:
     """Matrix rain effect implementation"""
     
-    def __init__(self):
-        self.console = Console()
+    def __init__(self, config: Optional[ZehraSecConfig] = None):
+        self.config = config
         self.colors = [Fore.GREEN, Fore.CYAN, Fore.WHITE, Fore.LIGHTGREEN_EX]
         self.chars = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789@#$%^&*"
+        self._resized = False
+        self.typer = TypingEffect()
         
-    def run_matrix(self, duration: int = 3):
-        """Run matrix effect for specified duration"""
+    def _setting(self, name: str, default):
+        return getattr(self.config, name, default) if self.config else default
+    
+    def _on_resize(self, signum, frame):
+        self._resized = True
+    
+    def create_rain(self, width: int, height: int, engine: Optional[str] = None) -> MatrixRain:
+        """Create the rain simulation for the configured engine"""
+        engine = (engine or self._setting("MATRIX_ENGINE", "python")).lower()
+        colors = (Fore.WHITE, Fore.LIGHTGREEN_EX, Fore.GREEN)
+        if engine == "numpy" or (engine == "auto" and numpy_available()):
+            try:
+                return NumpyMatrixRain(width, height, self.chars, *colors)
+            except ImportError:
+                pass
+        return MatrixRain(width, height, self.chars, *colors)
+    
+    def run_matrix(self, duration: Optional[float] = None,
+                   cancel_event: Optional[threading.Event] = None) -> Dict[str, float]:
+        """Run matrix effect for specified duration, returning render statistics"""
+        if duration is None:
+            duration = self._setting("MATRIX_DURATION", 3)
+        fps = max(1, self._setting("MATRIX_FPS", 20))
+        show_stats = self._setting("MATRIX_SHOW_STATS", True)
+        incremental = str(self._setting("MATRIX_RENDER", "diff")).lower() != "full"
+        
+        out = sys.stdout
+        size = shutil.get_terminal_size((80, 24))
+        rain_height = size.lines - 1 if show_stats else size.lines
+        rain = self.create_rain(size.columns, rain_height)
+        
+        # SIGWINCH can only be handled from the main thread; elsewhere poll the size
+        previous_handler = None
+        use_signal = hasattr(signal, "SIGWINCH") and threading.current_thread() is threading.main_thread()
+        if use_signal:
+            previous_handler = signal.signal(signal.SIGWINCH, self._on_resize)
+        self._resized = False
+        
+        frame_interval = 1.0 / fps
+        frames = 0
+        bytes_written = 0
+        achieved_fps = 0.0
+        stats_line = ""
+        start = time.perf_counter()
+        end_time = start + duration
+        next_tick = start
+        
+        out.write("\033[?25l\033[2J")
         try:
-            os.system('cls' if os.name == 'nt' else 'clear')
-            
-            print(f"{Fore.GREEN}Running Matrix Effect...{Style.RESET_ALL}")
-            
-            end_time = time.time() + duration
-            while time.time() < end_time:
-                # Simple matrix-like effect
-                for _ in range(5):
-                    line = ""
-                    for _ in range(80):
-                        if random.random() < 0.1:
-                            char = random.choice(self.chars)
-                            color = random.choice(self.colors)
-                            line += f"{color}{char}{Style.RESET_ALL}"
-                        else:
-                            line += " "
-                    print(line)
-                time.sleep(0.05)
+            while time.perf_counter() < end_time:
+                if cancel_event is not None and cancel_event.is_set():
+                    break
+                
+                if self._resized or (not use_signal and frames % fps == 0):
+                    self._resized = False
+                    new_size = shutil.get_terminal_size((80, 24))
+                    if new_size != size:
+                        size = new_size
+                        rain.resize(size.columns, size.lines - 1 if show_stats else size.lines)
+                        out.write("\033[2J")
                 
+                rain.step()
+                if incremental:
+                    buffer = rain.diff()
+                    if show_stats:
+                        buffer += f"\033[{rain.height + 1};1H" + stats_line
+                else:
+                    buffer = "\033[H" + rain.frame()
+                    if show_stats:
+                        buffer += "\n" + stats_line
+                out.write(buffer)
+                out.flush()
+                
+                frames += 1
+                bytes_written += len(buffer)
+                elapsed = time.perf_counter() - start
+                achieved_fps = (frames - 1) / elapsed if frames > 1 else 0.0
+                stats_line = (f"{Style.RESET_ALL}{Fore.YELLOW} {achieved_fps:5.1f}/{fps} fps | "
+                              f"{len(buffer)} B/frame | {rain.width}x{rain.height}\033[K{Style.RESET_ALL}")
+                
+                # Pace frames against a fixed schedule instead of sleeping a fixed amount
+                next_tick += frame_interval
+                delay = next_tick - time.perf_counter()
+                if delay > 0:
+                    if cancel_event is not None:
+                        cancel_event.wait(delay)
+                    else:
+                        time.sleep(delay)
+                else:
+                    next_tick = time.perf_counter()
+                    
         except KeyboardInterrupt:
             pass
+        finally:
+            if use_signal:
+                signal.signal(signal.SIGWINCH, previous_handler or signal.SIG_DFL)
+            out.write(f"{Style.RESET_ALL}\033[2J\033[H\033[?25h")
+            out.flush()
         
-    def typing_effect(self, text: str, delay: float = 0.02):
-        """Create typing effect for text"""
-        for char in text:
-            print(char, end='', flush=True)
-            time.sleep(delay)
-        print()
+        return {
+            "frames": frames,
+            "fps": achieved_fps,
+            "bytes_per_frame": bytes_written / frames if frames else 0,
+        }
+        
+    def typing_effect(self, text: str, delay: Optional[float] = None) -> bool:
+        """Create typing effect for text, returning True if a key press skipped it"""
+        if delay is None:
+            delay = self._setting("TYPING_SPEED", 0.02)
+        return self.typer.type(text, delay, animate=self._setting("ENABLE_ANIMATIONS", True))
+
+class BannerCache:
+    """LRU cache of banner file contents, invalidated by file mtime and size"""
+    
+    def __init__(self, max_entries: int = 32, max_bytes: int = 1024 * 1024):
+        self.max_entries = max(1, max_entries)
+        self.max_bytes = max(0, max_bytes)
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[int, int, str]]" = OrderedDict()
+        self._total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def get(self, key: Tuple[str, str], stat: os.stat_result) -> Optional[str]:
+        """Return cached content if the file has not changed since it was cached"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        
+        mtime_ns, size, content = entry
+        if mtime_ns != stat.st_mtime_ns or size != stat.st_size:
+            self._remove(key)
+            self.misses += 1
+            return None
+        
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return content
+    
+    def put(self, key: Tuple[str, str], stat: os.stat_result, content: str):
+        """Store content, evicting least recently used entries over the limits"""
+        if key in self._entries:
+            self._remove(key)
+        
+        if stat.st_size > self.max_bytes:
+            return
+        
+        self._entries[key] = (stat.st_mtime_ns, stat.st_size, content)
+        self._total_bytes += stat.st_size
+        
+        while len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+    
+    def clear(self):
+        """Drop all cached banners"""
+        self._entries.clear()
+        self._total_bytes = 0
+    
+    def _remove(self, key: Tuple[str, str]):
+        _, size, _ = self._entries.pop(key)
+        self._total_bytes -= size
+    
+    def stats(self) -> Dict[str, int]:
+        """Return cache counters"""
+        return {
+            "entries": len(self._entries),
+            "bytes": self._total_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+class BannerCatalog:
+    """Persistent index of banner files, rescanned per category when its directory mtime changes"""
+    
+    VERSION = 1
+    
+    def __init__(self, art_dir: Path, index_file: Path):
+        self.art_dir = art_dir
+        self.index_file = index_file
+        self.generation = 0
+        self.rescans = 0
+        self._data = self._load()
+        
+    def _empty(self) -> Dict:
+        return {"version": self.VERSION, "art_dir": str(self.art_dir.resolve()), "categories": {}}
+    
+    def _load(self) -> Dict:
+        """Load the index, discarding it if it belongs to another art directory"""
+        try:
+            data = json.loads(self.index_file.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return self._empty()
+        
+        if (not isinstance(data, dict) or data.get("version") != self.VERSION
+                or data.get("art_dir") != str(self.art_dir.resolve())
+                or not isinstance(data.get("categories"), dict)):
+            return self._empty()
+        return data
+    
+    def _save(self):
+        """Atomically replace the on-disk index"""
+        tmp_file = self.index_file.with_suffix(".tmp")
+        try:
+            tmp_file.write_text(json.dumps(self._data, separators=(',', ':')), encoding='utf-8')
+            os.replace(tmp_file, self.index_file)
+        except OSError:
+            pass
+    
+    def refresh(self, categories: List[str]) -> bool:
+        """Bring the given categories up to date, returning True if anything changed"""
+        changed = False
+        for category in categories:
+            changed |= self._refresh_category(category)
+        
+        if changed:
+            self.generation += 1
+            self._save()
+        return changed
+    
+    def _refresh_category(self, category: str) -> bool:
+        categories = self._data["categories"]
+        category_path = self.art_dir / category
+        try:
+            dir_stat = category_path.stat()
+        except OSError:
+            return categories.pop(category, None) is not None
+        
+        cached = categories.get(category)
+        if cached is not None and cached.get("mtime_ns") == dir_stat.st_mtime_ns:
+            return False
+        
+        self.rescans += 1
+        previous = cached.get("entries", {}) if cached else {}
+        entries = {}
+        try:
+            with os.scandir(category_path) as it:
+                for item in it:
+                    if not item.name.endswith(".txt") or not item.is_file():
+                        continue
+                    file_stat = item.stat()
+                    name = item.name[:-4]
+                    old = previous.get(name)
+                    if old and old["mtime_ns"] == file_stat.st_mtime_ns and old["size"] == file_stat.st_size:
+                        entries[name] = old
+                    else:
+                        entries[name] = self._describe(Path(item.path), file_stat)
+        except OSError:
+            return categories.pop(category, None) is not None
+        
+        categories[category] = {
+            "mtime_ns": dir_stat.st_mtime_ns,
+            "entries": dict(sorted(entries.items())),
+        }
+        return True
+    
+    @staticmethod
+    def _describe(path: Path, file_stat: os.stat_result) -> Dict[str, int]:
+        """Collect display metadata for a single banner file"""
+        try:
+            text = path.read_text(encoding='utf-8')
+        except UnicodeDecodeError:
+            text = path.read_text(encoding='latin-1')
+        except OSError:
+            text = ""
+        lines = text.splitlines()
+        return {
+            "lines": len(lines),
+            "width": max((len(line) for line in lines), default=0),
+            "size": file_stat.st_size,
+            "mtime_ns": file_stat.st_mtime_ns,
+        }
+    
+    def entries(self, category: str) -> Dict[str, Dict[str, int]]:
+        """Return banner name -> metadata for an indexed category"""
+        cached = self._data["categories"].get(category)
+        return cached["entries"] if cached else {}
+
+class RandomBannerPicker:
+    """Constant-time weighted random selection over a flat banner index"""
+    
+    MAX_RECENT_RETRIES = 8
+    
+    def __init__(self, weights: Optional[Dict[str, float]] = None, recent_window: int = 0,
+                 seed: Optional[int] = None):
+        self.weights = weights or {}
+        self.rng = random.Random(seed)
+        self.generation = None
+        self._items: List[Tuple[str, str]] = []
+        self._prob: List[float] = []
+        self._alias: List[int] = []
+        self._recent = deque(maxlen=max(0, recent_window))
+        
+    @staticmethod
+    def parse_weights(spec: str) -> Dict[str, float]:
+        """Parse a "category:weight,category:weight" specification"""
+        weights = {}
+        for part in spec.split(','):
+            if ':' not in part:
+                continue
+            category, value = (p.strip() for p in part.split(':', 1))
+            try:
+                weights[category] = max(0.0, float(value))
+            except ValueError:
+                continue
+        return weights
+    
+    def rebuild(self, library: Dict[str, List[str]], generation: Optional[int] = None):
+        """Rebuild the flat index and alias table from category -> banner names"""
+        items = []
+        item_weights = []
+        for category, names in library.items():
+            weight = self.weights.get(category, 1.0)
+            if weight <= 0:
+                continue
+            for name in names:
+                items.append((category, f"{name}.txt"))
+                item_weights.append(weight)
+        
+        self._items = items
+        self.generation = generation
+        known = set(items)
+        self._recent = deque((item for item in self._recent if item in known), maxlen=self._recent.maxlen)
+        
+        if len(set(item_weights)) <= 1:
+            self._prob, self._alias = [], []
+            return
+        
+        # Vose's alias method
+        n = len(items)
+        total = sum(item_weights)
+        scaled = [w * n / total for w in item_weights]
+        prob = [1.0] * n
+        alias = list(range(n))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            prob[s] = scaled[s]
+            alias[s] = l
+            scaled[l] -= 1.0 - scaled[s]
+            (small if scaled[l] < 1.0 else large).append(l)
+        self._prob, self._alias = prob, alias
+    
+    def _sample(self) -> Tuple[str, str]:
+        i = self.rng.randrange(len(self._items))
+        if self._prob and self.rng.random() >= self._prob[i]:
+            i = self._alias[i]
+        return self._items[i]
+    
+    def pick(self) -> Optional[Tuple[str, str]]:
+        """Pick a banner, avoiding the recently shown window when possible"""
+        if not self._items:
+            return None
+        
+        choice = self._sample()
+        for _ in range(self.MAX_RECENT_RETRIES):
+            if choice not in self._recent:
+                break
+            choice = self._sample()
+        
+        if self._recent.maxlen:
+            self._recent.append(choice)
+        return choice
+    
+    def __len__(self) -> int:
+        return len(self._items)
 
 class ASCIIArtManager:
     """Manage ASCII art collections and banners"""
     
     def __init__(self, config: ZehraSecConfig):
         self.config = config
-        self.art_dir = Path("ascii_art")
+        self.art_dir = Path(__file__).resolve().parent / "ascii_art"
         self.art_dir.mkdir(exist_ok=True)
+        self.cache = BannerCache(config.ASCII_CACHE_MAX_ENTRIES, config.ASCII_CACHE_MAX_BYTES) \
+            if config.CACHE_ASCII_ART else None
+        self.seed_manifest_file = self.art_dir / ".seed_manifest.json"
+        self.startup_io = {"stats": 0, "reads": 0, "writes": 0, "bytes_written": 0, "mkdirs": 0}
+        
+        start = time.perf_counter()
         self._create_default_ascii_art()
+        self.catalog = BannerCatalog(self.art_dir, config.catalog_file)
+        self.random_picker = RandomBannerPicker(
+            RandomBannerPicker.parse_weights(config.RANDOM_BANNER_WEIGHTS),
+            config.RANDOM_BANNER_RECENT,
+            config.RANDOM_BANNER_SEED if config.RANDOM_BANNER_SEED >= 0 else None
+        )
+        self.startup_io["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        if self.startup_io["writes"]:
+            self.config.log_activity(
+                f"Seeded ASCII art: {self.startup_io['writes']} writes, "
+                f"{self.startup_io['bytes_written']} bytes", event="art_seeded"
+            )
         
     def _create_default_ascii_art(self):
         """Create default ASCII art collections"""
         # Create category directories
         for category in self.config.BANNER_CATEGORIES:
             category_dir = self.art_dir / category
-            category_dir.mkdir(exist_ok=True)
+            self.startup_io["stats"] += 1
+            if not category_dir.is_dir():
+                category_dir.mkdir(exist_ok=True)
+                self.startup_io["mkdirs"] += 1
             
         # Create default ZehraSec banner
         zehrasec_banner = '''
@@ -162,14 +1616,14 @@ class ASCIIArtManager:
         Developed by Yashab Alam - CEO of ZehraSec
 '''
         
-        default_file = self.art_dir / "logoasciiart" / "zehrasec_inc.txt"
-        default_file.write_text(zehrasec_banner, encoding='utf-8')
+        seeds = {"logoasciiart/zehrasec_inc.txt": zehrasec_banner}
         
         # Create other sample ASCII art
-        self._create_sample_art()
+        seeds.update(self._create_sample_art())
+        self._seed_art_files(seeds)
         
-    def _create_sample_art(self):
-        """Create sample ASCII art files"""
+    def _create_sample_art(self) -> Dict[str, str]:
+        """Return sample ASCII art files keyed by path relative to the art directory"""
         art_samples = {
             "logoasciiart/linux.txt": '''
         .88888888:.
@@ -267,21 +1721,107 @@ class ASCIIArtManager:
 Create your own banners with the 'createbanner' command!
 '''        }
         
-        for path, content in art_samples.items():
+        return art_samples
+    
+    def _seed_art_files(self, seeds: Dict[str, str]):
+        """Write bundled art files that are missing or changed since last seeded"""
+        manifest = self._load_seed_manifest()
+        seeded = manifest.get("files", {})
+        manifest_changed = False
+        
+        for path, content in seeds.items():
+            digest = hashlib.sha256(content.encode('utf-8')).hexdigest()
             file_path = self.art_dir / path
-            file_path.parent.mkdir(parents=True, exist_ok=True)
-            file_path.write_text(content, encoding='utf-8')
+            
+            self.startup_io["stats"] += 1
+            exists = file_path.exists()
+            
+            if exists and self.config.SEED_ASCII_ART_ONCE:
+                if seeded.get(path) == digest:
+                    continue
+                if path not in seeded:
+                    # Adopt files that already match the bundled copy (ignoring line endings)
+                    self.startup_io["reads"] += 1
+                    try:
+                        text = file_path.read_bytes().replace(b'\r\n', b'\n')
+                        on_disk = hashlib.sha256(text).hexdigest()
+                    except OSError:
+                        on_disk = None
+                    if on_disk == digest:
+                        seeded[path] = digest
+                        manifest_changed = True
+                        continue
+            
+            try:
+                if not file_path.parent.is_dir():
+                    file_path.parent.mkdir(parents=True, exist_ok=True)
+                    self.startup_io["mkdirs"] += 1
+                file_path.write_text(content, encoding='utf-8')
+            except OSError as e:
+                self.config.log_activity(f"Unable to seed {path}: {e}", "WARNING")
+                continue
+            
+            self.startup_io["writes"] += 1
+            self.startup_io["bytes_written"] += len(content.encode('utf-8'))
+            if seeded.get(path) != digest:
+                seeded[path] = digest
+                manifest_changed = True
+        
+        if manifest_changed:
+            manifest["files"] = seeded
+            self._save_seed_manifest(manifest)
+    
+    def _load_seed_manifest(self) -> Dict:
+        """Load the manifest of previously seeded art files"""
+        self.startup_io["stats"] += 1
+        if not self.seed_manifest_file.exists():
+            return {"version": 1, "files": {}}
+        
+        self.startup_io["reads"] += 1
+        try:
+            manifest = json.loads(self.seed_manifest_file.read_text(encoding='utf-8'))
+            if isinstance(manifest, dict) and isinstance(manifest.get("files"), dict):
+                return manifest
+        except (OSError, ValueError):
+            pass
+        return {"version": 1, "files": {}}
+    
+    def _save_seed_manifest(self, manifest: Dict):
+        """Atomically replace the seed manifest"""
+        data = json.dumps(manifest, indent=2, sort_keys=True)
+        tmp_file = self.seed_manifest_file.with_suffix(".tmp")
+        try:
+            tmp_file.write_text(data, encoding='utf-8')
+            os.replace(tmp_file, self.seed_manifest_file)
+        except OSError as e:
+            self.config.log_activity(f"Unable to write seed manifest: {e}", "WARNING")
+            return
+        self.startup_io["writes"] += 1
+        self.startup_io["bytes_written"] += len(data.encode('utf-8'))
     
     def get_banner(self, category: str = "logoasciiart", filename: str = "zehrasec_inc.txt") -> str:
         """Get banner content from specified category and file"""
         banner_path = self.art_dir / category / filename
-        if banner_path.exists():
-            try:
-                return banner_path.read_text(encoding='utf-8')
-            except UnicodeDecodeError:
-                # Fallback to latin-1 if UTF-8 fails
-                return banner_path.read_text(encoding='latin-1')
-        return self.get_default_banner()
+        try:
+            stat = banner_path.stat()
+        except OSError:
+            return self.get_default_banner()
+        
+        key = (category, filename)
+        if self.cache is not None:
+            content = self.cache.get(key, stat)
+            if content is not None:
+                return content
+        
+        try:
+            content = banner_path.read_text(encoding='utf-8')
+        except UnicodeDecodeError:
+            # Fallback to latin-1 if UTF-8 fails
+            content = banner_path.read_text(encoding='latin-1')
+        
+        if self.cache is not None:
+            self.cache.put(key, stat, content)
+        return content
     
     def get_default_banner(self) -> str:
         """Get default ZehraSec banner"""
@@ -289,166 +1829,1056 @@ Create your own banners with the 'createbanner' command!
     
     def list_banners(self, category: str) -> List[str]:
         """List all banners in a category"""
-        category_path = self.art_dir / category
-        if category_path.exists():
-            return [f.stem for f in category_path.glob("*.txt")]
-        return []
+        return list(self.banner_entries(category))
+    
+    def banner_entries(self, category: str) -> Dict[str, Dict[str, int]]:
+        """Return banner name -> metadata (lines, width, size, mtime) for a category"""
+        self.catalog.refresh([category])
+        return self.catalog.entries(category)
     
     def get_random_banner(self) -> Tuple[str, str]:
         """Get a random banner from any category"""
-        category = random.choice(self.config.BANNER_CATEGORIES)
-        banners = self.list_banners(category)
-        if banners:
-            banner = random.choice(banners)
-            return category, f"{banner}.txt"
+        categories = self.config.BANNER_CATEGORIES
+        self.catalog.refresh(categories)
+        if self.random_picker.generation != self.catalog.generation:
+            library = {category: list(self.catalog.entries(category)) for category in categories}
+            self.random_picker.rebuild(library, self.catalog.generation)
+        
+        choice = self.random_picker.pick()
+        if choice:
+            return choice
         return "logoasciiart", "zehrasec_inc.txt"
 
-class SecurityManager:
-    """Handle authentication and security features"""
+class SessionExpired(Exception):
+    """Raised at the prompt when the idle timeout passes"""
+
+class DeadlineWatchdog:
+    """Background thread running callbacks at monotonic deadlines, idle until the earliest one"""
+    
+    def __init__(self):
+        self._heap = []
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+        self._stopped = False
+        self._thread = None
+        
+    def schedule(self, deadline: float, callback) -> List:
+        """Run callback (in the watchdog thread) once time.monotonic() reaches deadline"""
+        entry = [deadline, next(self._counter), callback]
+        with self._condition:
+            heapq.heappush(self._heap, entry)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="zehrasec-watchdog", daemon=True)
+                self._thread.start()
+            elif self._heap[0] is entry:
+                self._condition.notify()
+        return entry
+    
+    def cancel(self, entry: List):
+        """Cancel a scheduled callback; it is dropped when it reaches the top of the heap"""
+        with self._condition:
+            entry[2] = None
+    
+    def stop(self):
+        """Stop the thread without running pending callbacks"""
+        with self._condition:
+            self._stopped = True
+            self._heap.clear()
+            self._condition.notify()
+    
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._stopped:
+                    if not self._heap:
+                        self._condition.wait()
+                        continue
+                    timeout = self._heap[0][0] - time.monotonic()
+                    if timeout <= 0:
+                        break
+                    self._condition.wait(timeout)
+                if self._stopped:
+                    return
+                _, _, callback = heapq.heappop(self._heap)
+            if callback is not None:
+                try:
+                    callback()
+                except Exception as e:
+                    logging.error(f"Watchdog callback failed: {e}")
+
+class Session:
+    """Logged-in session tracked in memory against a monotonic idle deadline"""
+    
+    def __init__(self, session_id: str, timeout: float):
+        self.id = session_id
+        self.timeout = timeout
+        self.start_time = time.time()
+        self.last_activity = time.monotonic()
+        self.deadline = self.last_activity + timeout
+        
+    def touch(self):
+        """Record activity and push the idle deadline back"""
+        self.last_activity = time.monotonic()
+        self.deadline = self.last_activity + self.timeout
+    
+    def remaining(self) -> float:
+        """Seconds left before the session expires"""
+        return self.deadline - time.monotonic()
+    
+    def is_valid(self) -> bool:
+        """Check the idle deadline; immune to wall-clock changes"""
+        return time.monotonic() < self.deadline
+    
+    def to_dict(self) -> Dict:
+        """Session data as persisted in the session registry (wall-clock timestamps)"""
+        idle = time.monotonic() - self.last_activity
+        return {
+            "id": self.id,
+            "start_time": self.start_time,
+            "last_activity": time.time() - idle
+        }
+
+class SessionTokens:
+    """Session ids from secrets.token_bytes, and HMAC-SHA256 signatures over session records
+    
+    Needs only a key file, so anything sharing the home directory (the terminal, a future
+    daemon) can issue ids and check each other's records.
+    """
+    
+    ID_BYTES = 16
+    KEY_BYTES = 32
+    
+    def __init__(self, key_file: Path):
+        self.key_file = key_file
+        self._key = None
+        self._mac = None
+        
+    @property
+    def key(self) -> bytes:
+        """The signing key, created (0600) on first use"""
+        if self._key is None:
+            try:
+                key = self.key_file.read_bytes()
+            except FileNotFoundError:
+                key = self._create_key()
+            if len(key) < self.KEY_BYTES:
+                raise ValueError(f"{self.key_file} holds {len(key)} bytes, expected {self.KEY_BYTES}")
+            self._key = key
+        return self._key
+    
+    def _create_key(self) -> bytes:
+        """Write a new key to a private temp file and hard-link it into place
+        
+        The link either publishes a complete key or fails because another terminal published
+        one first, in which case that key is used; a half-written key is never visible.
+        """
+        key = secrets.token_bytes(self.KEY_BYTES)
+        tmp_file = self.key_file.with_name(f"{self.key_file.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(key)
+                f.flush()
+                os.fsync(f.fileno())
+            try:
+                os.link(tmp_file, self.key_file)
+            except FileExistsError:
+                return self.key_file.read_bytes()
+            return key
+        finally:
+            try:
+                tmp_file.unlink()
+            except OSError:
+                pass
+    
+    def new_id(self) -> str:
+        """Unpredictable session id: 128 random bits as hex"""
+        return secrets.token_bytes(self.ID_BYTES).hex()
+    
+    def sign(self, payload: bytes) -> str:
+        # Copying a keyed HMAC skips re-deriving the inner and outer pads on every call
+        if self._mac is None:
+            self._mac = hmac.new(self.key, digestmod=hashlib.sha256)
+        mac = self._mac.copy()
+        mac.update(payload)
+        return mac.hexdigest()
+    
+    def verify(self, payload: bytes, signature: str) -> bool:
+        """Constant-time signature check"""
+        return hmac.compare_digest(self.sign(payload), signature)
+    
+    @staticmethod
+    def _canonical(record: Dict) -> bytes:
+        return json.dumps(record, sort_keys=True, separators=(',', ':')).encode('utf-8')
+    
+    def seal(self, record: Dict) -> Dict:
+        """Copy of record with a "sig" over every other field"""
+        sealed = {key: value for key, value in record.items() if key != "sig"}
+        sealed["sig"] = self.sign(self._canonical(sealed))
+        return sealed
+    
+    def unseal(self, record: Dict) -> Optional[Dict]:
+        """record without its signature, or None if unsigned or altered"""
+        signature = record.get("sig")
+        if not isinstance(signature, str):
+            return None
+        body = {key: value for key, value in record.items() if key != "sig"}
+        return body if self.verify(self._canonical(body), signature) else None
+
+class SessionRegistry:
+    """Live sessions of every terminal sharing this home directory, one file per session id
+    
+    Each process only ever writes its own entry, so concurrent terminals never overwrite each
+    other; lookups by id open a single file. Entries whose process is gone (or, for other hosts
+    sharing the home directory, whose heartbeat stopped) are removed whenever the registry is listed.
+    Entries are signed, and one that fails verification is never trusted (or its pid signalled).
+    """
+    
+    ID_RE = re.compile(r"[0-9a-f]{8,64}")
+    
+    def __init__(self, directory: Path, heartbeat_interval: float, tokens: SessionTokens):
+        self.directory = directory
+        self.stale_after = 3 * heartbeat_interval
+        self.hostname = platform.node()
+        self.tokens = tokens
+        
+    def path(self, session_id: str) -> Path:
+        if not self.ID_RE.fullmatch(session_id):
+            raise ValueError(f"Invalid session id: {session_id!r}")
+        return self.directory / f"{session_id}.json"
+    
+    def write(self, entry: Dict):
+        """Atomically create or replace an entry"""
+        self.directory.mkdir(mode=0o700, exist_ok=True)
+        path = self.path(entry["id"])
+        # The heartbeat thread and the command loop may both save the entry
+        tmp_file = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_file.write_text(json.dumps(self.tokens.seal(entry), separators=(',', ':')), encoding='utf-8')
+        os.replace(tmp_file, path)
+    
+    def read(self, session_id: str) -> Tuple[Optional[Dict], bool]:
+        """(entry, authentic): the entry as stored, and whether its signature checks out"""
+        try:
+            entry = json.loads(self.path(session_id).read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return None, False
+        if not isinstance(entry, dict):
+            return None, False
+        body = self.tokens.unseal(entry)
+        return (body, True) if body is not None else (entry, False)
+    
+    def get(self, session_id: str) -> Optional[Dict]:
+        """The verified entry, or None if missing or tampered with"""
+        entry, authentic = self.read(session_id)
+        return entry if authentic else None
+    
+    def remove(self, session_id: str):
+        try:
+            self.path(session_id).unlink()
+        except (OSError, ValueError):
+            pass
+    
+    def is_stale(self, entry: Dict, now: float) -> bool:
+        """Dead process on this host, or no heartbeat lately from another host"""
+        if entry.get("host") != self.hostname:
+            return now - float(entry.get("heartbeat", 0)) > self.stale_after
+        started = entry.get("process_started")
+        try:
+            process = psutil.Process(int(entry.get("pid", 0)))
+            if started is None:
+                return False  # start time unknown when the entry was written: the live pid has to do
+            # A recycled pid belongs to a process started later than ours
+            return abs(process.create_time() - float(started)) > 1
+        except psutil.AccessDenied:
+            return False  # the pid exists, its start time is just not readable
+        except (psutil.Error, ValueError, TypeError):
+            return True
+    
+    def entries(self) -> List[Dict]:
+        """Live sessions, oldest first; stale entries are garbage-collected on the way"""
+        now = time.time()
+        live = []
+        try:
+            names = [entry.name for entry in os.scandir(self.directory) if entry.name.endswith(".json")]
+        except OSError:
+            return live
+        for name in names:
+            session_id = name[:-len(".json")]
+            if not self.ID_RE.fullmatch(session_id):
+                continue
+            entry, authentic = self.read(session_id)
+            if entry is None:
+                continue
+            if not authentic:
+                logging.warning(f"Removing session file {name}: signature missing or invalid",
+                                extra={"event": "session_tampered"})
+                self.remove(session_id)
+                continue
+            if self.is_stale(entry, now):
+                self.remove(session_id)
+                continue
+            live.append(entry)
+        live.sort(key=lambda entry: entry.get("start_time", 0))
+        return live
+    
+    def find(self, prefix: str) -> List[Dict]:
+        """Entries whose id is, or starts with, prefix"""
+        if len(prefix) == 2 * SessionTokens.ID_BYTES:
+            entry = self.get(prefix) if self.ID_RE.fullmatch(prefix) else None
+            return [entry] if entry is not None else []
+        return [entry for entry in self.entries() if entry["id"].startswith(prefix)]
+    
+    def kill(self, entry: Dict) -> bool:
+        """Ask the owning terminal to end its session (SIGTERM); stale entries are just removed"""
+        if self.is_stale(entry, time.time()):
+            self.remove(entry["id"])
+            return True
+        if entry.get("host") != self.hostname:
+            return False
+        os.kill(int(entry["pid"]), signal.SIGTERM)
+        return True
+
+class AttemptLimiter:
+    """Failed-login record shared by every terminal process: sliding-window rate limit with
+    exponentially growing lockouts
+    
+    Each update is a read-modify-write under an exclusive lock on a separate lock file,
+    written to a temp file and renamed into place, so concurrent logins never lose a failure
+    and readers never see a torn record.
+    """
+    
+    def __init__(self, path: Path, max_attempts: int, window: float, lockout: float, max_lockout: float):
+        self.path = path
+        self.lock_path = path.with_suffix(".lock")  # the data file is replaced on every write, so lock a sibling
+        self.max_attempts = max_attempts
+        self.window = window
+        self.lockout = lockout
+        self.max_lockout = max_lockout
+        
+    @contextlib.contextmanager
+    def _locked(self, exclusive: bool = True):
+        fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            with locked_fd(fd, exclusive):
+                yield
+        finally:
+            os.close(fd)
+    
+    def _read(self) -> Dict:
+        try:
+            record = json.loads(self.path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            record = None
+        if not isinstance(record, dict):
+            record = {}
+        return {
+            "failures": [float(t) for t in record.get("failures", []) if isinstance(t, (int, float))],
+            "lock_until": float(record.get("lock_until", 0) or 0),
+            "lockouts": int(record.get("lockouts", 0) or 0),
+        }
+    
+    def _write(self, record: Dict):
+        tmp_file = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        with open(tmp_file, "w", encoding='utf-8') as f:
+            json.dump(record, f, separators=(',', ':'))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, self.path)
+    
+    def _prune(self, record: Dict, now: float):
+        record["failures"] = [t for t in record["failures"] if now - t < self.window]
+        # A quiet spell as long as the longest lockout forgives earlier lockouts
+        last = max(record["failures"] + [record["lock_until"]])
+        if record["lockouts"] and now - last > self.max_lockout:
+            record["lockouts"] = 0
+    
+    def status(self) -> Tuple[int, float]:
+        """(failures in the current window, seconds of lockout left)"""
+        now = time.time()
+        with self._locked(exclusive=False):
+            record = self._read()
+        self._prune(record, now)
+        return len(record["failures"]), max(0.0, record["lock_until"] - now)
+    
+    def record_failure(self) -> Dict:
+        """Count a failure; returns failures, remaining attempts and any lockout just imposed"""
+        now = time.time()
+        with self._locked():
+            record = self._read()
+            self._prune(record, now)
+            record["failures"].append(now)
+            failures = len(record["failures"])
+            lock_seconds = 0.0
+            if failures >= self.max_attempts:
+                lock_seconds = min(self.max_lockout, self.lockout * 2 ** record["lockouts"])
+                record["lockouts"] += 1
+                record["lock_until"] = now + lock_seconds
+                record["failures"] = []
+            self._write(record)
+        return {"failures": failures, "remaining": max(0, self.max_attempts - failures),
+                "lock_seconds": lock_seconds, "lockouts": record["lockouts"]}
+    
+    def merge(self, failures: int, lock_until: float):
+        """Fold counters kept elsewhere by older versions into the record"""
+        now = time.time()
+        with self._locked():
+            record = self._read()
+            record["failures"].extend([now] * max(0, failures))
+            record["lock_until"] = max(record["lock_until"], lock_until)
+            self._write(record)
+    
+    def reset(self):
+        """Forget failures and lockouts after a successful login"""
+        with self._locked():
+            self._write({"failures": [], "lock_until": 0, "lockouts": 0})
+
+class SecurityManager:
+    """Handle authentication and security features"""
+    
+    DEFAULT_ROUNDS = 12  # bcrypt.gensalt() default
+    MIN_ROUNDS = 10  # calibration never picks a weaker cost, however slow the host
+    MAX_ROUNDS = 16
+    LATENCY_SAMPLES = 100  # login verifications kept for percentiles
+    
+    def __init__(self, config: ZehraSecConfig):
+        self.config = config
+        self.state = config.state
+        self.session = None
+        self._persisted_at = 0.0
+        self._pass_lock = threading.Lock()
+        self.attempts = AttemptLimiter(config.attempts_file, config.MAX_FAIL_ATTEMPTS, config.RATE_LIMIT_WINDOW,
+                                       config.LOCKOUT_DURATION, config.LOCKOUT_MAX_DURATION)
+        self.tokens = SessionTokens(config.session_key_file)
+        self.registry = SessionRegistry(config.sessions_dir, config.SESSION_HEARTBEAT_INTERVAL, self.tokens)
+        self._process = None
+        self._migrate_attempts()
+        
+    def hash_rounds(self) -> int:
+        """bcrypt cost for new hashes: BCRYPT_ROUNDS, else the calibrated cost, else bcrypt's default"""
+        if self.config.BCRYPT_ROUNDS > 0:
+            return self.config.BCRYPT_ROUNDS
+        calibrated = self.state.get("bcrypt_rounds")
+        return calibrated if isinstance(calibrated, int) else self.DEFAULT_ROUNDS
+    
+    def needs_rehash(self, hashed: str) -> bool:
+        """True when the stored hash is legacy, another scheme, or made at a lower cost"""
+        return zehrasec_passwd.needs_update(hashed, self.config.PASSWORD_SCHEME, self.hash_rounds())
+    
+    def calibrate(self, target_ms: float,
+                  cancel_event: Optional[threading.Event] = None) -> Tuple[int, List[Tuple[int, float]]]:
+        """Time bcrypt at increasing costs; the highest cost hashing within target_ms wins
+        
+        Setting cancel_event stops before the next cost is timed; the timings so far are returned.
+        """
+        timings = []
+        best = self.MIN_ROUNDS
+        for rounds in range(self.MIN_ROUNDS, self.MAX_ROUNDS + 1):
+            if cancel_event is not None and cancel_event.is_set():
+                break
+            salt = bcrypt.gensalt(rounds=rounds)
+            samples = []
+            for _ in range(3 if rounds <= self.MIN_ROUNDS + 1 else 1):
+                start = time.perf_counter()
+                bcrypt.hashpw(b"zehrasec-calibration", salt)
+                samples.append((time.perf_counter() - start) * 1000)
+            elapsed_ms = min(samples)
+            timings.append((rounds, elapsed_ms))
+            if elapsed_ms > target_ms:
+                break
+            best = rounds
+        return best, timings
+    
+    def hash_password(self, password: str) -> str:
+        """Hash password with the configured scheme and cost"""
+        return zehrasec_passwd.hash_password(password, self.config.PASSWORD_SCHEME, self.hash_rounds())
+    
+    def save_password_hash(self, hashed: str, replaces: Optional[str] = None) -> bool:
+        """Atomically write the password file; with replaces, only if it still holds that hash"""
+        pass_file = self.config.pass_file
+        with self._pass_lock:
+            if replaces is not None:
+                try:
+                    if pass_file.read_text(encoding='utf-8').strip() != replaces:
+                        return False
+                except OSError:
+                    return False
+            zehrasec_passwd.write_hash(pass_file, hashed)
+        return True
+    
+    def record_login_latency(self, latency_ms: float) -> Dict[str, float]:
+        """Remember a verification time; returns p50/p90/p99 over the recent ones"""
+        samples = self.state.get("login_latency_ms")
+        samples = samples[-(self.LATENCY_SAMPLES - 1):] if isinstance(samples, list) else []
+        samples.append(latency_ms)
+        self.state.set("login_latency_ms", samples)
+        
+        ordered = sorted(samples)
+        def nearest_rank(p: int) -> float:
+            return ordered[max(1, -(-p * len(ordered) // 100)) - 1]
+        return {"p50": nearest_rank(50), "p90": nearest_rank(90), "p99": nearest_rank(99), "samples": len(ordered)}
+    
+    def verify_password(self, password: str, hashed: str) -> bool:
+        """Verify password against a current or legacy hash"""
+        return zehrasec_passwd.verify_password(password, hashed)
+    
+    def _migrate_attempts(self):
+        """Move counters from state.json (or the fails/locktime files it imported) into the shared record"""
+        fails = self.state.get("failed_attempts")
+        lock_until = self.state.get("lock_until")
+        if fails is None and lock_until is None:
+            return
+        try:
+            self.attempts.merge(int(fails or 0), float(lock_until or 0))
+        except (OSError, TypeError, ValueError):
+            return
+        self.state.delete("failed_attempts")
+        self.state.delete("lock_until")
+    
+    def lockout_remaining(self) -> float:
+        """Seconds until the account unlocks, 0 when it is not locked"""
+        try:
+            return self.attempts.status()[1]
+        except OSError:
+            return 0.0
+    
+    def is_account_locked(self) -> bool:
+        """Check if account is currently locked"""
+        return self.lockout_remaining() > 0
+    
+    def get_failed_attempts(self) -> int:
+        """Failed login attempts within the rate-limit window"""
+        try:
+            return self.attempts.status()[0]
+        except OSError:
+            return 0
+    
+    def increment_failed_attempts(self) -> Dict:
+        """Record a failed login, locking the account when the window's limit is reached"""
+        result = self.attempts.record_failure()
+        if result["lock_seconds"]:
+            self.config.log_activity(
+                f"Account locked for {result['lock_seconds']:.0f}s after {result['failures']} failed attempts",
+                "WARNING", event="lockout", failed_attempts=result["failures"],
+                lock_seconds=result["lock_seconds"], lockouts=result["lockouts"])
+        return result
+    
+    def reset_failed_attempts(self):
+        """Reset failed login attempts"""
+        self.attempts.reset()
+    
+    def validate_password_strength(self, password: str) -> Tuple[bool, str]:
+        """Validate password strength"""
+        if len(password) < self.config.MIN_PASSWORD_LENGTH:
+            return False, f"Password must be at least {self.config.MIN_PASSWORD_LENGTH} characters long"
+        
+        has_letter = any(c.isalpha() for c in password)
+        has_digit = any(c.isdigit() for c in password)
+        
+        if not has_letter or not has_digit:
+            return False, "Password must contain both letters and numbers"
+        
+        return True, "Password is strong"
+    
+    def create_session(self) -> str:
+        """Create new session"""
+        session_id = self.tokens.new_id()
+        self.session = Session(session_id, self.config.SESSION_TIMEOUT)
+        self.config.audit_context["session"] = session_id
+        self.state.delete("session")  # sessions used to live in state.json, one per home directory
+        self.persist_session()
+        return session_id
+    
+    def is_session_valid(self) -> bool:
+        """Check if current session is valid"""
+        return self.session is not None and self.session.is_valid()
+    
+    def update_session_activity(self):
+        """Update session last activity time, saving it at most every SESSION_PERSIST_INTERVAL"""
+        if self.session is None:
+            return
+        self.session.touch()
+        if self.session.last_activity - self._persisted_at >= self.config.SESSION_PERSIST_INTERVAL:
+            self.persist_session()
+    
+    def persist_session(self):
+        """Write the in-memory session, with a fresh heartbeat, to the session registry now"""
+        session = self.session
+        if session is None:
+            return
+        entry = session.to_dict()
+        entry.update(self._process_info())
+        entry["timeout"] = session.timeout
+        entry["heartbeat"] = time.time()
+        try:
+            self.registry.write(entry)
+        except (OSError, ValueError) as e:
+            logging.warning(f"Unable to save session {session.id}: {e}")
+        self._persisted_at = time.monotonic()
+    
+    def _process_info(self) -> Dict:
+        """pid, tty, user and host of this terminal, looked up once"""
+        if self._process is None:
+            try:
+                tty = os.ttyname(sys.stdin.fileno()) if sys.stdin.isatty() else None
+            except (OSError, AttributeError, ValueError):
+                tty = None
+            try:
+                process_started = psutil.Process().create_time()
+            except psutil.Error:
+                process_started = None
+            self._process = {"pid": os.getpid(), "process_started": process_started, "tty": tty,
+                             "user": getpass.getuser(), "host": self.registry.hostname}
+        return self._process
+    
+    def end_session(self):
+        """Forget the current session"""
+        session, self.session = self.session, None
+        self.config.audit_context["session"] = None
+        if session is not None:
+            self.registry.remove(session.id)
+
+class MetricsSampler:
+    """System metrics via psutil: static facts cached for the process, CPU usage from deltas"""
+    
+    def __init__(self, disk_path: Optional[str] = None):
+        self.disk_path = disk_path or os.path.abspath(os.sep)
+        self._static = None
+        self._cpu_times = None
+        self._core_times = None
+        self._cpu_percent = 0.0
+        self._core_percent = []
+        self._net = None  # (monotonic time, bytes sent, bytes received)
+        self._net_rates = (0.0, 0.0)
+        self._lock = threading.Lock()
+        
+    def prime(self):
+        """Record the CPU baseline and cache static facts, so the first sample is instant"""
+        self.static()
+        with self._lock:
+            self._cpu_times = psutil.cpu_times()
+            self._core_times = psutil.cpu_times(percpu=True)
+            self._net = self._net_counters()
+    
+    @staticmethod
+    def _net_counters():
+        try:
+            counters = psutil.net_io_counters()
+        except Exception:
+            return None
+        return (time.monotonic(), counters.bytes_sent, counters.bytes_recv) if counters else None
+    
+    def static(self) -> Dict:
+        """Facts that do not change while the terminal runs"""
+        if self._static is None:
+            facts = {
+                "system": f"{platform.system()} {platform.release()}",
+                "machine": platform.machine(),
+                "processor": platform.processor() or platform.machine(),
+                "python": platform.python_version(),
+                "hostname": platform.node(),
+                "user": os.environ.get('USER', os.environ.get('USERNAME', 'Unknown')),
+            }
+            try:
+                facts["cores"] = psutil.cpu_count()
+                facts["physical_cores"] = psutil.cpu_count(logical=False)
+                facts["memory_total"] = psutil.virtual_memory().total
+            except Exception:
+                facts["cores"] = os.cpu_count()
+                facts["physical_cores"] = None
+                facts["memory_total"] = None
+            self._static = facts
+        return self._static
+    
+    @staticmethod
+    def _total_time(times) -> float:
+        # On Linux guest and guest_nice are already included in user and nice, as psutil accounts them
+        return sum(times) - getattr(times, "guest", 0) - getattr(times, "guest_nice", 0)
+    
+    @classmethod
+    def _busy_percent(cls, before, after) -> float:
+        idle = (after.idle + getattr(after, "iowait", 0)) - (before.idle + getattr(before, "iowait", 0))
+        total = cls._total_time(after) - cls._total_time(before)
+        return max(0.0, min(100.0, 100.0 * (1 - idle / total))) if total > 0 else 0.0
+    
+    def sample(self) -> Dict:
+        """CPU usage since the previous sample plus current memory, disk and load, in one pass"""
+        with self._lock:
+            cpu_times = psutil.cpu_times()
+            core_times = psutil.cpu_times(percpu=True)
+            if self._cpu_times is not None:
+                self._cpu_percent = self._busy_percent(self._cpu_times, cpu_times)
+                if len(self._core_times) == len(core_times):
+                    self._core_percent = [self._busy_percent(before, after)
+                                          for before, after in zip(self._core_times, core_times)]
+            self._cpu_times = cpu_times
+            self._core_times = core_times
+            cpu_percent = self._cpu_percent
+            core_percent = list(self._core_percent)
+            
+            net = self._net_counters()
+            if net is not None and self._net is not None and net[0] > self._net[0]:
+                elapsed = net[0] - self._net[0]
+                self._net_rates = ((net[1] - self._net[1]) / elapsed, (net[2] - self._net[2]) / elapsed)
+            self._net = net
+            net_rates = self._net_rates
+        
+        try:
+            load = psutil.getloadavg()
+        except (AttributeError, OSError):
+            load = None
+        
+        return {
+            "time": time.time(),
+            "cpu_percent": cpu_percent,
+            "core_percent": core_percent,
+            "memory": psutil.virtual_memory(),
+            "disk": psutil.disk_usage(self.disk_path),
+            "load": load,
+            "net_sent_rate": net_rates[0],
+            "net_recv_rate": net_rates[1],
+        }
+
+class ProcessTop:
+    """Ranks processes by one metric, reusing psutil.Process objects between refreshes"""
+    
+    METRICS = ("cpu", "rss", "io")
+    
+    def __init__(self):
+        self.processes = {}  # pid -> psutil.Process, kept so cpu_percent() works from deltas
+        self.count = 0  # processes ranked by the last refresh
+        self._io = {}  # pid -> (monotonic time, bytes read + written)
+        self._ticks = {}  # (pid, starttime) -> (monotonic time, utime + stime clock ticks), /proc fast path
+        
+        # On Linux, cpu and rss come from one raw read of /proc/<pid>/stat per process,
+        # which is several times cheaper than going through psutil for every pid
+        self.proc_fast_path = sys.platform.startswith("linux") and os.path.exists("/proc/self/stat")
+        if self.proc_fast_path:
+            self._clock_ticks = os.sysconf("SC_CLK_TCK")
+            self._page_size = os.sysconf("SC_PAGE_SIZE")
+        
+    def _sync(self):
+        """Track new pids and forget exited ones"""
+        pids = psutil.pids()
+        live = set(pids)
+        for pid in [pid for pid in self.processes if pid not in live]:
+            del self.processes[pid]
+            self._io.pop(pid, None)
+        for pid in pids:
+            if pid not in self.processes:
+                try:
+                    process = psutil.Process(pid)
+                    process.cpu_percent(None)  # baseline for the next refresh
+                    self.processes[pid] = process
+                except psutil.Error:
+                    pass
+    
+    def _io_rate(self, pid: int, process) -> float:
+        counters = process.io_counters()
+        now = time.monotonic()
+        total = counters.read_bytes + counters.write_bytes
+        previous = self._io.get(pid)
+        self._io[pid] = (now, total)
+        if previous is None or now <= previous[0]:
+            return 0.0
+        return (total - previous[1]) / (now - previous[0])
+    
+    def _process(self, pid: int):
+        """Cached psutil.Process for a pid, replaced if the pid was reused"""
+        process = self.processes.get(pid)
+        if process is None or not process.is_running():
+            process = psutil.Process(pid)
+            self.processes[pid] = process
+        return process
+    
+    def _refresh_proc(self, metric: str, count: int) -> List[Tuple[float, int, object]]:
+        now = time.monotonic()
+        values = []
+        ticks = {}
+        seen = set()
+        for name in os.listdir("/proc"):
+            if not name.isdigit():
+                continue
+            try:
+                fd = os.open(f"/proc/{name}/stat", os.O_RDONLY)
+                try:
+                    data = os.read(fd, 1024)
+                finally:
+                    os.close(fd)
+            except OSError:
+                continue  # exited since listdir
+            
+            pid = int(name)
+            seen.add(pid)
+            fields = data[data.rfind(b")") + 2:].split()  # the command name may contain spaces
+            if metric == "cpu":
+                total = int(fields[11]) + int(fields[12])
+                key = (pid, fields[19])  # starttime: a reused pid does not inherit the old baseline
+                ticks[key] = (now, total)
+                previous = self._ticks.get(key)
+                if previous is None or now <= previous[0]:
+                    value = 0.0
+                else:
+                    value = max(0, total - previous[1]) / self._clock_ticks / (now - previous[0]) * 100
+            else:
+                value = int(fields[21]) * self._page_size
+            values.append((value, pid))
+        
+        if metric == "cpu":
+            self._ticks = ticks
+        for pid in [pid for pid in self.processes if pid not in seen]:
+            del self.processes[pid]
+            self._io.pop(pid, None)
+        self.count = len(values)
+        
+        rows = []
+        for value, pid in heapq.nlargest(count, values):
+            try:
+                rows.append((value, pid, self._process(pid)))
+            except psutil.Error:
+                continue
+        return rows
+    
+    def refresh(self, metric: str = "cpu", count: int = 10) -> List[Tuple[float, int, object]]:
+        """Return the top `count` (value, pid, process) tuples for metric"""
+        if self.proc_fast_path and metric in ("cpu", "rss"):
+            return self._refresh_proc(metric, count)
+        
+        self._sync()
+        values = []
+        gone = []
+        for pid, process in self.processes.items():
+            try:
+                if metric == "cpu":
+                    value = process.cpu_percent(None)
+                elif metric == "rss":
+                    value = process.memory_info().rss
+                else:
+                    value = self._io_rate(pid, process)
+            except (psutil.NoSuchProcess, psutil.ZombieProcess):
+                gone.append(pid)
+                continue
+            except (psutil.AccessDenied, AttributeError):
+                continue
+            values.append((value, pid, process))
+        for pid in gone:
+            self.processes.pop(pid, None)
+            self._io.pop(pid, None)
+        self.count = len(values)
+        return heapq.nlargest(count, values, key=lambda item: item[0])
+
+class Command:
+    """A terminal command: handler, aliases, argument spec and help text"""
     
-    def __init__(self, config: ZehraSecConfig):
-        self.config = config
+    PLUGIN_CATEGORY = "🧩 PLUGIN COMMANDS"
+    
+    def __init__(self, name: str, handler, help: str = "", usage: str = "",
+                 aliases: Tuple[str, ...] = (), category: str = PLUGIN_CATEGORY, threaded: bool = False):
+        self.name = name
+        self.handler = handler  # called with the argument list; returning False ends the session
+        self.help = help
+        self.usage = usage  # e.g. "<name> [text]": <required> and [optional] arguments
+        self.aliases = tuple(aliases)
+        self.category = category
+        self.threaded = threaded  # runs in a worker thread; the handler must stop once cancel_event is set
+        required = usage
+        while True:  # <required> arguments nested inside [optional] groups do not count
+            stripped = re.sub(r"\[[^\[\]]*\]", "", required)
+            if stripped == required:
+                break
+            required = stripped
+        self.min_args = sum(1 for part in required.split() if part.startswith("<"))
         
-    def hash_password(self, password: str) -> str:
-        """Hash password using bcrypt"""
-        return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+    def __call__(self, args: List[str]):
+        return self.handler(args)
+
+class CommandRegistry:
+    """Command lookup table; plugin commands from entry points are imported on first use
     
-    def verify_password(self, password: str, hashed: str) -> bool:
-        """Verify password against hash"""
-        try:
-            return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
-        except:
-            return False
+    A plugin entry point names the command and points at either a Command or a
+    handler(terminal, args) function whose docstring's first line is the help text.
+    """
     
-    def is_account_locked(self) -> bool:
-        """Check if account is currently locked"""
-        if not self.config.locktime_file.exists():
-            return False
-        
-        try:
-            locktime = float(self.config.locktime_file.read_text(encoding='utf-8').strip())
-            return time.time() < locktime
-        except:
-            return False
+    PLUGIN_GROUP = "zehrasec.commands"
     
-    def get_failed_attempts(self) -> int:
-        """Get number of failed login attempts"""
-        if not self.config.fails_file.exists():
-            return 0
+    def __init__(self, terminal=None):
+        self.terminal = terminal
+        self.commands = {}  # primary name -> Command, in registration order
+        self._lookup = {}  # primary names and aliases -> Command
+        self._plugins = None
         
+    def register(self, command: Command) -> Command:
+        """Add a command under its name and aliases"""
+        for name in (command.name,) + command.aliases:
+            if name in self._lookup:
+                raise ValueError(f"Command '{name}' is already registered")
+        self.commands[command.name] = command
+        self._lookup[command.name] = command
+        for alias in command.aliases:
+            self._lookup[alias] = command
+        return command
+    
+    def add(self, name: str, handler, help: str = "", **options) -> Command:
+        """Register handler as a command"""
+        return self.register(Command(name, handler, help, **options))
+    
+    def get(self, name: str) -> Optional[Command]:
+        """Find a command by name or alias, loading a plugin if one provides it"""
+        command = self._lookup.get(name)
+        if command is None and name in self.plugin_names():
+            command = self._load_plugin(name)
+        return command
+    
+    def plugin_names(self) -> Dict:
+        """Entry points in the plugin group that are not loaded yet, by command name"""
+        if self._plugins is None:
+            self._plugins = {}
+            try:
+                from importlib.metadata import entry_points
+                for entry_point in entry_points(group=self.PLUGIN_GROUP):
+                    if entry_point.name not in self._lookup:
+                        self._plugins[entry_point.name] = entry_point
+            except Exception as e:
+                logging.warning(f"Unable to list command plugins: {e}")
+        return self._plugins
+    
+    def _load_plugin(self, name: str) -> Optional[Command]:
+        entry_point = self._plugins.pop(name)
         try:
-            return int(self.config.fails_file.read_text(encoding='utf-8').strip())
-        except:
-            return 0
+            target = entry_point.load()
+            if isinstance(target, Command):
+                command = target
+            else:
+                doc = (target.__doc__ or "").strip()
+                command = Command(name, lambda args: target(self.terminal, args), doc.splitlines()[0] if doc else "")
+            if command.name != name:
+                command.aliases += (name,)
+            return self.register(command)
+        except Exception as e:
+            logging.error(f"Unable to load command plugin '{name}' ({entry_point.value}): {e}")
+            print(f"{Fore.RED}❌ Plugin command '{name}' failed to load: {e}{Style.RESET_ALL}")
+            return None
     
-    def increment_failed_attempts(self):
-        """Increment failed login attempts"""
-        fails = self.get_failed_attempts() + 1
-        self.config.fails_file.write_text(str(fails), encoding='utf-8')
-        
-        if fails >= self.config.MAX_FAIL_ATTEMPTS:
-            locktime = time.time() + self.config.LOCKOUT_DURATION
-            self.config.locktime_file.write_text(str(locktime), encoding='utf-8')
-            self.config.log_activity(f"Account locked due to {fails} failed attempts", "WARNING")
+    def __iter__(self):
+        return iter(self.commands.values())
+
+def run_in_daemon_thread(loop, func, *args):
+    """Run func in a daemon thread and return an asyncio future for its result"""
+    future = loop.create_future()
     
-    def reset_failed_attempts(self):
-        """Reset failed login attempts"""
-        if self.config.fails_file.exists():
-            self.config.fails_file.unlink()
-        if self.config.locktime_file.exists():
-            self.config.locktime_file.unlink()
+    def resolve(method, value):
+        if not future.done():
+            getattr(future, method)(value)
     
-    def validate_password_strength(self, password: str) -> Tuple[bool, str]:
-        """Validate password strength"""
-        if len(password) < self.config.MIN_PASSWORD_LENGTH:
-            return False, f"Password must be at least {self.config.MIN_PASSWORD_LENGTH} characters long"
-        
-        has_letter = any(c.isalpha() for c in password)
-        has_digit = any(c.isdigit() for c in password)
-        
-        if not has_letter or not has_digit:
-            return False, "Password must contain both letters and numbers"
-        
-        return True, "Password is strong"
+    def target():
+        try:
+            result = func(*args)
+        except BaseException as e:
+            loop.call_soon_threadsafe(resolve, "set_exception", e)
+        else:
+            loop.call_soon_threadsafe(resolve, "set_result", result)
     
-    def create_session(self) -> str:
-        """Create new session"""
-        session_id = hashlib.sha256(f"{time.time()}{random.random()}".encode()).hexdigest()[:16]
-        session_data = {
-            "id": session_id,
-            "start_time": time.time(),
-            "last_activity": time.time()
-        }
-        self.config.session_file.write_text(json.dumps(session_data), encoding='utf-8')
-        return session_id
+    threading.Thread(target=target, name=f"zehrasec-{getattr(func, '__name__', 'task')}", daemon=True).start()
+    return future
+
+class LineReader:
+    """Reads prompt lines in a daemon thread so the event loop never blocks on stdin"""
     
-    def is_session_valid(self) -> bool:
-        """Check if current session is valid"""
-        if not self.config.session_file.exists():
-            return False
+    def __init__(self, loop):
+        self.loop = loop
+        self._pending = None  # input() still running from an abandoned read
+        self._current = None
         
+    async def read(self, prompt: str) -> str:
+        """Return the next line; raises EOFError, or whatever interrupt() was given"""
+        if self._pending is None or self._pending.done():
+            self._pending = run_in_daemon_thread(self.loop, input, prompt)
+        self._current = self.loop.create_future()
+        self._pending.add_done_callback(self._forward)
         try:
-            session_data = json.loads(self.config.session_file.read_text(encoding='utf-8'))
-            last_activity = session_data.get("last_activity", 0)
-            return (time.time() - last_activity) < self.config.SESSION_TIMEOUT
-        except:
-            return False
+            return await self._current
+        finally:
+            self._current = None
     
-    def update_session_activity(self):
-        """Update session last activity time"""
-        if self.config.session_file.exists():
-            try:
-                session_data = json.loads(self.config.session_file.read_text(encoding='utf-8'))
-                session_data["last_activity"] = time.time()
-                self.config.session_file.write_text(json.dumps(session_data), encoding='utf-8')
-            except:
-                pass
+    def _forward(self, pending):
+        current = self._current
+        if current is None or current.done():
+            return
+        if pending.exception() is not None:
+            current.set_exception(pending.exception())
+        else:
+            current.set_result(pending.result())
+            
+    def interrupt(self, exc: BaseException) -> bool:
+        """Abandon the read in progress with exc; the typed line is kept for the next read"""
+        if self._current is None or self._current.done():
+            return False
+        self._current.set_exception(exc)
+        return True
 
 class ZehraSecTerminal:
     """Main ZehraSec Terminal class"""
     
-    def __init__(self):
+    CANCEL_GRACE = 0.5  # seconds a cancelled command gets to stop on its own before it is abandoned
+    
+    def __init__(self, profiler: Optional[StartupProfiler] = None):
+        self.profiler = profiler or StartupProfiler()
         self.config = ZehraSecConfig()
+        self.profiler.mark("config")
         self.security = SecurityManager(self.config)
         self.ascii_art = ASCIIArtManager(self.config)
-        self.matrix = MatrixEffect()
-        self.console = Console()
+        self.profiler.mark("ascii art")
+        self.matrix = MatrixEffect(self.config)
+        self.metrics = MetricsSampler()
+        self.process_top = None
+        self.audit_index = None
+        self._console = None
           # Current settings
         self.current_prompt = self._load_prompt()
         self.current_banner_info = self._load_banner_info()
         
         # Command history
         self.command_history = []
+        self.commands = self._register_commands()
+        
+        # Async REPL state
+        self.cancel_event = threading.Event()  # replaced for each threaded command, set by Ctrl-C
+        self._loop = None
+        self._reader = None
+        self._command_future = None
+        self._at_prompt = False
+    
+    @property
+    def console(self):
+        """Rich console, created on first use"""
+        if self._console is None:
+            self._console = rich_console.Console()
+        return self._console
     
     def _load_prompt(self) -> str:
         """Load current prompt setting"""
-        if self.config.prompt_file.exists():
-            return self.config.prompt_file.read_text(encoding='utf-8').strip()
-        return self.config.DEFAULT_PROMPT
+        return self.config.state.get("prompt") or self.config.DEFAULT_PROMPT
     
     def _save_prompt(self, prompt: str):
         """Save prompt setting"""
-        self.config.prompt_file.write_text(prompt, encoding='utf-8')
+        self.config.state.set("prompt", prompt)
         self.current_prompt = prompt
     
     def _load_banner_info(self) -> Dict[str, str]:
         """Load current banner information"""
-        if self.config.banner_file.exists():
-            try:
-                return json.loads(self.config.banner_file.read_text(encoding='utf-8'))
-            except:
-                pass
+        banner_info = self.config.state.get("banner")
+        if isinstance(banner_info, dict) and "category" in banner_info and "filename" in banner_info:
+            return banner_info
         return {"category": "logoasciiart", "filename": "zehrasec_inc.txt"}
     
     def _save_banner_info(self, category: str, filename: str):
         """Save banner information"""
         banner_info = {"category": category, "filename": filename}
-        self.config.banner_file.write_text(json.dumps(banner_info), encoding='utf-8')
+        self.config.state.set("banner", banner_info)
         self.current_banner_info = banner_info
     
     def display_banner(self):
         """Display current banner"""
-        os.system('cls' if os.name == 'nt' else 'clear')
+        clear_screen()
         
         banner = self.ascii_art.get_banner(
             self.current_banner_info["category"],
@@ -464,10 +2894,13 @@ class ZehraSecTerminal:
     
     def authenticate(self) -> bool:
         """Handle user authentication"""
+        self.profiler.report()
+        
         # Check if account is locked
-        if self.security.is_account_locked():
+        remaining = self.security.lockout_remaining()
+        if remaining:
             print(f"{Fore.RED}❌ Account is locked due to failed login attempts.{Style.RESET_ALL}")
-            print(f"{Fore.YELLOW}⏰ Please try again later.{Style.RESET_ALL}")
+            print(f"{Fore.YELLOW}⏰ Please try again in {int(remaining) + 1} seconds.{Style.RESET_ALL}")
             return False
         
         # Check if password exists
@@ -497,10 +2930,10 @@ class ZehraSecTerminal:
             
             # Save password
             hashed = self.security.hash_password(password)
-            self.config.pass_file.write_text(hashed)
+            self.security.save_password_hash(hashed)
             
             print(f"{Fore.GREEN}✅ Password set successfully!{Style.RESET_ALL}")
-            self.config.log_activity("Password set successfully")
+            self.config.log_activity("Password set successfully", event="password_set")
             return True
     
     def _login(self) -> bool:
@@ -510,119 +2943,326 @@ class ZehraSecTerminal:
         
         max_attempts = 3
         for attempt in range(max_attempts):
+            if attempt and self.security.is_account_locked():
+                print(f"{Fore.RED}❌ Account is locked due to failed login attempts.{Style.RESET_ALL}")
+                return False
             password = getpass.getpass(f"{Fore.GREEN}Enter password: {Style.RESET_ALL}")
               # Load stored password hash
             stored_hash = self.config.pass_file.read_text(encoding='utf-8').strip()
             
-            if self.security.verify_password(password, stored_hash):
+            verified, latency_ms = self._verify_with_spinner(password, stored_hash)
+            percentiles = self.security.record_login_latency(latency_ms)
+            if verified:
                 print(f"{Fore.GREEN}✅ Authentication successful!{Style.RESET_ALL}")
                 self.security.reset_failed_attempts()
                 self.security.create_session()
-                self.config.log_activity("Successful login")
+                self.config.log_activity("Successful login", event="login_success", latency_ms=latency_ms)
+                self.config.log_activity(
+                    f"Login verification p50 {percentiles['p50']} ms, p90 {percentiles['p90']} ms, "
+                    f"p99 {percentiles['p99']} ms over {percentiles['samples']} logins",
+                    event="login_latency", **percentiles)
+                if self.security.needs_rehash(stored_hash):
+                    self._rehash_in_background(password, stored_hash)
                 return True
             else:
-                remaining = max_attempts - attempt - 1
+                # The count is shared with logins in other terminals, so it can run out early
+                result = self.security.increment_failed_attempts()
+                self.config.log_activity(f"Failed login attempt {attempt + 1}", "WARNING",
+                                         event="login_failure", latency_ms=latency_ms)
+                if result["lock_seconds"]:
+                    print(f"{Fore.RED}❌ Invalid password. Account locked for "
+                          f"{result['lock_seconds']:.0f} seconds.{Style.RESET_ALL}")
+                    return False
+                remaining = min(result["remaining"], max_attempts - attempt - 1)
                 if remaining > 0:
                     print(f"{Fore.RED}❌ Invalid password. {remaining} attempts remaining.{Style.RESET_ALL}")
                 else:
                     print(f"{Fore.RED}❌ Invalid password. Maximum attempts reached.{Style.RESET_ALL}")
-                
-                self.security.increment_failed_attempts()
-                self.config.log_activity(f"Failed login attempt {attempt + 1}", "WARNING")
         
         return False
     
+    def _sessions_command(self, args: List[str]):
+        action = args[0].lower() if args else "list"
+        try:
+            if action == "list" and len(args) <= 1:
+                self.show_sessions()
+            elif action == "kill" and len(args) == 2:
+                self.kill_session(args[1].lower())
+            else:
+                print(f"{Fore.RED}❌ Usage: sessions [list|kill <id>]{Style.RESET_ALL}")
+        except (OSError, ValueError) as e:
+            # The signing key is unreadable or damaged
+            print(f"{Fore.RED}❌ Session registry unavailable: {e}{Style.RESET_ALL}")
+    
+    def show_sessions(self):
+        """Table of live sessions from the registry"""
+        def ago(seconds: float) -> str:
+            seconds = max(0, int(seconds))
+            if seconds < 60:
+                return f"{seconds}s"
+            if seconds < 3600:
+                return f"{seconds // 60}m {seconds % 60:02d}s"
+            return f"{seconds // 3600}h {seconds % 3600 // 60:02d}m"
+        
+        # Our own entry is refreshed first so its idle time is current
+        self.security.persist_session()
+        entries = self.security.registry.entries()
+        current = self.security.session.id if self.security.session else None
+        now = time.time()
+        
+        table = rich_table.Table(title=f"👥 Live Sessions ({len(entries)})", show_header=True,
+                                 header_style="bold magenta")
+        table.add_column("ID", style="cyan")
+        table.add_column("PID", justify="right")
+        table.add_column("TTY")
+        table.add_column("User@Host", style="green")
+        table.add_column("Started")
+        table.add_column("Idle", justify="right")
+        table.add_column("Heartbeat", justify="right")
+        for entry in entries:
+            marker = " (this)" if entry["id"] == current else ""
+            started = datetime.datetime.fromtimestamp(entry.get("start_time", 0))
+            started = started.strftime("%H:%M:%S" if started.date() == datetime.date.today() else "%m-%d %H:%M")
+            table.add_row(entry["id"][:8] + marker, str(entry.get("pid", "?")), entry.get("tty") or "-",
+                          f"{entry.get('user', '?')}@{entry.get('host', '?')}", started,
+                          ago(now - entry.get("last_activity", now)), ago(now - entry.get("heartbeat", now)) + " ago")
+        self.console.print(table)
+    
+    def kill_session(self, prefix: str):
+        """End another terminal's session by id or unique id prefix"""
+        matches = self.security.registry.find(prefix)
+        if not matches:
+            print(f"{Fore.RED}❌ No live session matches '{prefix}'{Style.RESET_ALL}")
+            return
+        if len(matches) > 1:
+            print(f"{Fore.RED}❌ '{prefix}' matches {len(matches)} sessions; use more of the id{Style.RESET_ALL}")
+            return
+        
+        entry = matches[0]
+        if self.security.session is not None and entry["id"] == self.security.session.id:
+            print(f"{Fore.YELLOW}💡 That is this session; use 'logout' instead{Style.RESET_ALL}")
+            return
+        try:
+            ended = self.security.registry.kill(entry)
+        except (OSError, ValueError) as e:
+            print(f"{Fore.RED}❌ Unable to end session {entry['id'][:8]}: {e}{Style.RESET_ALL}")
+            return
+        if not ended:
+            print(f"{Fore.RED}❌ Session {entry['id'][:8]} runs on {entry.get('host')}; "
+                  f"end it from there{Style.RESET_ALL}")
+            return
+        
+        self.config.log_activity(f"Ended session {entry['id']} (pid {entry.get('pid')})", "WARNING",
+                                 event="session_kill", target=entry["id"])
+        print(f"{Fore.GREEN}✅ Session {entry['id'][:8]} ended{Style.RESET_ALL}")
+    
+    def _verify_with_spinner(self, password: str, stored_hash: str) -> Tuple[bool, float]:
+        """Check the password in a worker thread while this one animates a spinner"""
+        result = {}
+        
+        def verify():
+            started = time.perf_counter()
+            result["verified"] = self.security.verify_password(password, stored_hash)
+            result["latency_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        
+        worker = threading.Thread(target=verify, name="verify-password", daemon=True)
+        worker.start()
+        worker.join(0.1)  # cheap hashes finish before a spinner is worth drawing
+        
+        frames = itertools.cycle("⠋⠙⠹⠸⠼⠴⠦⠧⠇⠏")
+        drawn = False
+        while worker.is_alive():
+            sys.stdout.write(f"\r{Fore.CYAN}{next(frames)} Verifying password...{Style.RESET_ALL}")
+            sys.stdout.flush()
+            drawn = True
+            worker.join(0.08)
+        if drawn:
+            sys.stdout.write("\r\033[K")
+            sys.stdout.flush()
+        return result["verified"], result["latency_ms"]
+    
+    def _rehash_in_background(self, password: str, old_hash: str):
+        """Upgrade a hash made at an outdated cost without delaying the prompt"""
+        def rehash():
+            started = time.perf_counter()
+            hashed = self.security.hash_password(password)
+            try:
+                saved = self.security.save_password_hash(hashed, replaces=old_hash)
+            except OSError as e:
+                self.config.log_activity(f"Password rehash failed: {e}", "ERROR", event="password_rehash")
+                return
+            if saved:
+                self.config.log_activity(
+                    f"Password rehashed from {zehrasec_passwd.describe(old_hash)} to {zehrasec_passwd.describe(hashed)}",
+                    event="password_rehash", latency_ms=round((time.perf_counter() - started) * 1000, 1))
+        
+        # Not a daemon: exiting right after login still lets the new hash reach disk
+        threading.Thread(target=rehash, name="rehash-password").start()
+    
+    def _calibratehash_command(self, args: List[str]):
+        try:
+            target_ms = float(args[0]) if args else float(self.config.HASH_TARGET_MS)
+        except ValueError:
+            print(f"{Fore.RED}❌ Usage: calibratehash [target_ms]{Style.RESET_ALL}")
+            return
+        
+        print(f"{Fore.CYAN}⏱️  Benchmarking bcrypt costs against a {target_ms:g} ms target...{Style.RESET_ALL}")
+        cancel_event = self.cancel_event
+        best, timings = self.security.calibrate(target_ms, cancel_event)
+        if cancel_event.is_set():
+            return  # Ctrl-C: keep the current cost
+        for rounds, elapsed_ms in timings:
+            marker = f" {Fore.GREEN}◀ selected{Style.RESET_ALL}" if rounds == best else ""
+            color = Fore.GREEN if elapsed_ms <= target_ms else Fore.RED
+            print(f"  cost {rounds:>2}  {color}{elapsed_ms:8.1f} ms{Style.RESET_ALL}{marker}")
+        if timings[0][1] > target_ms:
+            print(f"{Fore.YELLOW}⚠️  Even cost {best} exceeds the target; keeping it as the minimum{Style.RESET_ALL}")
+        
+        self.config.state.set("bcrypt_rounds", best)
+        self.config.state.flush()
+        self.config.log_activity(f"Calibrated bcrypt cost {best} for a {target_ms:g} ms target",
+                                 event="hash_calibrated", rounds=best, target_ms=target_ms)
+        
+        if self.config.BCRYPT_ROUNDS > 0:
+            print(f"{Fore.YELLOW}💡 BCRYPT_ROUNDS={self.config.BCRYPT_ROUNDS} in your config overrides "
+                  f"the calibrated cost{Style.RESET_ALL}")
+            return
+        stored = self.config.pass_file.read_text(encoding='utf-8').strip() if self.config.pass_file.exists() else ""
+        if stored and self.security.needs_rehash(stored):
+            print(f"{Fore.GREEN}✅ Cost {best} saved; your password will be rehashed at the next login{Style.RESET_ALL}")
+        else:
+            print(f"{Fore.GREEN}✅ Cost {best} saved{Style.RESET_ALL}")
+    
     def show_help(self):
-        """Display help information"""
-        help_text = f"""
+        """Display help information, generated from the command registry"""
+        lines = [f"""
 {Fore.CYAN}╔══════════════════════════════════════════════════════════════════════════════╗
 ║                    🛡️  ZehraSec Terminal v2.2.0 - Help  🛡️                   ║
-╚══════════════════════════════════════════════════════════════════════════════╝{Style.RESET_ALL}
-
-{Fore.YELLOW}📋 CORE COMMANDS:{Style.RESET_ALL}
-  {Fore.GREEN}help{Style.RESET_ALL}              - Display this help message
-  {Fore.GREEN}status{Style.RESET_ALL}            - Show system and security status
-  {Fore.GREEN}clear{Style.RESET_ALL}             - Clear screen and redisplay banner
-  {Fore.GREEN}matrix{Style.RESET_ALL}            - Show matrix effect animation
-  {Fore.GREEN}sysinfo{Style.RESET_ALL}           - Display detailed system information
-  {Fore.GREEN}changepass{Style.RESET_ALL}        - Change your password securely
-  {Fore.GREEN}logout{Style.RESET_ALL}            - End session and exit safely
-  {Fore.GREEN}exit{Style.RESET_ALL}              - Exit the terminal
-
-{Fore.YELLOW}🎨 BANNER CUSTOMIZATION:{Style.RESET_ALL}
-  {Fore.GREEN}changebanner{Style.RESET_ALL}      - Interactive banner customization menu
-  {Fore.GREEN}setbanner{Style.RESET_ALL}         - Set banner (alias for changebanner)
-  {Fore.GREEN}randombanner{Style.RESET_ALL}      - Set random theme from collections
-  {Fore.GREEN}previewthemes{Style.RESET_ALL}     - Preview all available themes
-  {Fore.GREEN}resetbanner{Style.RESET_ALL}       - Reset to default ZehraSec banner
-  {Fore.GREEN}browseart{Style.RESET_ALL}         - Browse ASCII art by category
-  {Fore.GREEN}currentbanner{Style.RESET_ALL}     - Show current banner information
-
-{Fore.YELLOW}🎭 CUSTOM BANNERS:{Style.RESET_ALL}
-  {Fore.CYAN}createbanner{Style.RESET_ALL}      - Interactive custom banner creator
-  {Fore.CYAN}addbanner <name>{Style.RESET_ALL}  - Quick custom banner creation
-  {Fore.CYAN}editbanner <name>{Style.RESET_ALL} - Edit existing custom banner
-  {Fore.CYAN}deletebanner <name>{Style.RESET_ALL} - Delete custom banner
-  {Fore.CYAN}listcustom{Style.RESET_ALL}        - List all custom banners
-  {Fore.CYAN}importbanner <file> <name>{Style.RESET_ALL} - Import banner from file
-  {Fore.CYAN}exportbanner <name> <file>{Style.RESET_ALL} - Export custom banner
-
-{Fore.YELLOW}🎭 CUSTOM BANNER CREATION:{Style.RESET_ALL}
-  {Fore.GREEN}createbanner{Style.RESET_ALL}      - Interactive custom banner creator
-  {Fore.GREEN}addbanner <name>{Style.RESET_ALL}  - Create new custom banner with name
-  {Fore.GREEN}editbanner <name>{Style.RESET_ALL} - Edit existing custom banner
-  {Fore.GREEN}deletebanner <name>{Style.RESET_ALL} - Delete custom banner
-  {Fore.GREEN}listcustom{Style.RESET_ALL}        - List all custom banners
-  {Fore.GREEN}importbanner <file> <name>{Style.RESET_ALL} - Import banner from file
-  {Fore.GREEN}exportbanner <name> <file>{Style.RESET_ALL} - Export custom banner to file
-
-{Fore.YELLOW}💻 PROMPT CUSTOMIZATION:{Style.RESET_ALL}
-  {Fore.GREEN}changeprompt{Style.RESET_ALL}      - Interactive prompt customization menu
-  {Fore.GREEN}prompt{Style.RESET_ALL}            - Prompt customization (alias)
-  {Fore.GREEN}setprompt [text]{Style.RESET_ALL}  - Set custom prompt text directly
-  {Fore.GREEN}resetprompt{Style.RESET_ALL}       - Reset to default ZehraSec prompt
-  {Fore.GREEN}listprompts{Style.RESET_ALL}       - Show all predefined prompt options
-  {Fore.GREEN}currentprompt{Style.RESET_ALL}     - Display current prompt information
-
-{Fore.YELLOW}🔧 SYSTEM COMMANDS:{Style.RESET_ALL}
-  {Fore.GREEN}update{Style.RESET_ALL}            - Check for system updates
-  {Fore.GREEN}clean{Style.RESET_ALL}             - Clean temporary files
-  {Fore.GREEN}backup{Style.RESET_ALL}            - Create backup of customizations
-  {Fore.GREEN}restore{Style.RESET_ALL}           - Restore previous backup
-
-{Fore.BLUE}💡 TIP: Use 'Tab' completion and command history with Up/Down arrows{Style.RESET_ALL}
+╚══════════════════════════════════════════════════════════════════════════════╝{Style.RESET_ALL}"""]
+        
+        categories = OrderedDict()
+        for command in self.commands:
+            usage = f"{command.name} {command.usage}".strip()
+            aliases = f" (alias: {', '.join(command.aliases)})" if command.aliases else ""
+            categories.setdefault(command.category, []).append((usage, command.help + aliases))
+        for name in sorted(self.commands.plugin_names()):
+            categories.setdefault(Command.PLUGIN_CATEGORY, []).append((name, "Plugin command (loaded on first use)"))
+        
+        for category, rows in categories.items():
+            lines.append(f"\n{Fore.YELLOW}{category}:{Style.RESET_ALL}")
+            for usage, text in rows:
+                lines.append(f"  {Fore.GREEN}{usage:<17}{Style.RESET_ALL} - {text}")
+        
+        lines.append(f"""
+{Fore.BLUE}💡 TIP: Use command history with Up/Down arrows{Style.RESET_ALL}
 {Fore.MAGENTA}🛡️ Developed by Yashab Alam - CEO of ZehraSec{Style.RESET_ALL}
-"""
-        print(help_text)
+""")
+        print("\n".join(lines))
+    
+    def _register_commands(self) -> CommandRegistry:
+        """Build the command table"""
+        registry = CommandRegistry(self)
+        add = registry.add
+        
+        core = "📋 CORE COMMANDS"
+        add("help", lambda args: self.show_help(), "Display this help message", category=core)
+        add("status", self._status_command, "Show system and security status",
+            usage="[--watch [seconds]]", category=core, threaded=True)
+        add("clear", lambda args: self.display_banner(), "Clear screen and redisplay banner", category=core)
+        add("matrix", self._matrix_command, "Show matrix effect animation", category=core, threaded=True)
+        add("sysinfo", lambda args: self.show_system_info(), "Display detailed system information",
+            category=core)
+        add("top", self._top_command, "Rank processes by CPU, memory or I/O", usage="[cpu|rss|io] [count]",
+            category=core, threaded=True)
+        add("auditlog", self._auditlog_command, "Search the audit log",
+            usage="[--since T] [--until T] [--level L] [--event E] [--limit N] [--follow]",
+            category=core, threaded=True)
+        add("sessions", self._sessions_command, "List live sessions or end one", usage="[list|kill <id>]",
+            category=core)
+        add("changepass", lambda args: self.change_password(), "Change your password securely", category=core)
+        add("calibratehash", self._calibratehash_command, "Pick the bcrypt cost for this machine",
+            usage="[target_ms]", category=core, threaded=True)
+        add("logout", self._logout_command, "End session and exit safely", category=core)
+        add("exit", lambda args: False, "Exit the terminal", aliases=("quit",), category=core)
+        
+        banners = "🎨 BANNER CUSTOMIZATION"
+        add("changebanner", lambda args: self.change_banner_interactive(),
+            "Interactive banner customization menu", aliases=("setbanner",), category=banners)
+        add("randombanner", lambda args: self.set_random_banner(), "Set random theme from collections",
+            category=banners)
+        add("previewthemes", lambda args: self._preview_themes(), "Preview all available themes", category=banners)
+        add("resetbanner", lambda args: self.reset_banner(), "Reset to default ZehraSec banner", category=banners)
+        add("browseart", lambda args: self._browse_art_categories(), "Browse ASCII art by category",
+            category=banners)
+        add("currentbanner", lambda args: self.show_current_banner_info(), "Show current banner information",
+            category=banners)
+        
+        prompts = "💻 PROMPT CUSTOMIZATION"
+        add("changeprompt", lambda args: self.change_prompt_interactive(),
+            "Interactive prompt customization menu", aliases=("prompt",), category=prompts)
+        add("setprompt", lambda args: self.set_prompt_direct(' '.join(args)), "Set custom prompt text directly",
+            usage="[text]", category=prompts)
+        add("resetprompt", lambda args: self.reset_prompt(), "Reset to default ZehraSec prompt", category=prompts)
+        add("listprompts", lambda args: self.list_prompts(), "Show all predefined prompt options",
+            category=prompts)
+        add("currentprompt", lambda args: self.show_current_prompt_info(), "Display current prompt information",
+            category=prompts)
+        
+        system = "🔧 SYSTEM COMMANDS"
+        add("update", self._update_command, "Check for system updates", category=system)
+        add("clean", lambda args: self.clean_temp_files(), "Clean temporary files", category=system, threaded=True)
+        add("backup", lambda args: self.backup_settings(), "Create backup of customizations", category=system)
+        add("restore", lambda args: self.restore_settings(), "Restore previous backup", category=system)
+        return registry
+    
+    def _prime_metrics(self):
+        try:
+            self.metrics.prime()
+        except Exception as e:
+            self.config.log_activity(f"Unable to prime system metrics: {e}", "WARNING")
+    
+    def _matrix_command(self, args: List[str]):
+        self.matrix.run_matrix(cancel_event=self.cancel_event)
+        self.display_banner()
+    
+    def _logout_command(self, args: List[str]) -> bool:
+        print(f"{Fore.YELLOW}👋 Logging out... Session ended.{Style.RESET_ALL}")
+        self.security.end_session()
+        return False
+    
+    def _update_command(self, args: List[str]):
+        print(f"{Fore.CYAN}🔄 Checking for updates...{Style.RESET_ALL}")
+        print(f"{Fore.GREEN}✅ ZehraSec Terminal v2.2.0 is up to date!{Style.RESET_ALL}")
     
     def show_status(self):
         """Display system and security status"""
-        console = Console()
+        console = self.console
         
         # System Information
-        system_table = Table(title="🖥️ System Information", show_header=True, header_style="bold magenta")
+        system_table = rich_table.Table(title="🖥️ System Information", show_header=True, header_style="bold magenta")
         system_table.add_column("Property", style="cyan", no_wrap=True)
         system_table.add_column("Value", style="yellow")
         
-        system_table.add_row("Operating System", f"{platform.system()} {platform.release()}")
-        system_table.add_row("Architecture", platform.machine())
-        system_table.add_row("Python Version", platform.python_version())
-        system_table.add_row("Hostname", platform.node())
+        facts = self.metrics.static()
+        system_table.add_row("Operating System", facts["system"])
+        system_table.add_row("Architecture", facts["machine"])
+        system_table.add_row("Python Version", facts["python"])
+        system_table.add_row("Hostname", facts["hostname"])
         
         # Memory and CPU info
         try:
             memory = psutil.virtual_memory()
             system_table.add_row("Total Memory", f"{memory.total // (1024**3)} GB")
             system_table.add_row("Available Memory", f"{memory.available // (1024**3)} GB")
-            system_table.add_row("CPU Cores", str(psutil.cpu_count()))
-        except:
+            system_table.add_row("CPU Cores", str(facts["cores"]))
+        except Exception:
             system_table.add_row("System Stats", "Unable to retrieve")
         
         console.print(system_table)
         print()
         
         # Security Status
-        security_table = Table(title="🔒 Security Status", show_header=True, header_style="bold red")
+        security_table = rich_table.Table(title="🔒 Security Status", show_header=True, header_style="bold red")
         security_table.add_column("Security Feature", style="cyan", no_wrap=True)
         security_table.add_column("Status", style="green")
         
@@ -646,7 +3286,7 @@ class ZehraSecTerminal:
         print()
         
         # Customization Status
-        custom_table = Table(title="🎨 Customization Status", show_header=True, header_style="bold blue")
+        custom_table = rich_table.Table(title="🎨 Customization Status", show_header=True, header_style="bold blue")
         custom_table.add_column("Setting", style="cyan", no_wrap=True)
         custom_table.add_column("Current Value", style="yellow")
         
@@ -654,35 +3294,281 @@ class ZehraSecTerminal:
         custom_table.add_row("Banner Category", self.current_banner_info["category"])
         custom_table.add_row("Banner File", self.current_banner_info["filename"])
         
+        io = self.ascii_art.startup_io
+        custom_table.add_row(
+            "Startup Art I/O",
+            f"{io['writes']} writes ({io['bytes_written']} bytes), {io['reads']} reads, "
+            f"{io['stats']} stats in {io.get('elapsed_ms', 0)} ms"
+        )
+        
+        if self.ascii_art.cache is not None:
+            cache_stats = self.ascii_art.cache.stats()
+            custom_table.add_row(
+                "Banner Cache",
+                f"{cache_stats['hits']} hits / {cache_stats['misses']} misses "
+                f"({cache_stats['entries']} entries, {cache_stats['bytes']} bytes)"
+            )
+        
         console.print(custom_table)
     
+    def _status_command(self, args: List[str]):
+        if args and args[0] in ("--watch", "-w"):
+            try:
+                interval = float(args[1]) if len(args) > 1 else self.config.STATUS_WATCH_INTERVAL
+            except ValueError:
+                print(f"{Fore.RED}❌ Usage: status --watch [seconds]{Style.RESET_ALL}")
+                return
+            self.watch_status(max(0.2, interval))
+        else:
+            self.show_status()
+    
+    def _status_values(self) -> Dict[str, str]:
+        """Formatted dashboard values from one incremental metrics sample"""
+        def size(value: float) -> str:
+            for unit in ("B", "KB", "MB", "GB"):
+                if value < 1024:
+                    return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+                value /= 1024
+            return f"{value:.1f} TB"
+        
+        sample = self.metrics.sample()
+        memory = sample["memory"]
+        disk = sample["disk"]
+        load = sample["load"]
+        session = self.security.session
+        remaining = max(0, int(session.remaining())) if session is not None else 0
+        
+        return {
+            "CPU": f"{sample['cpu_percent']:5.1f}%",
+            "Per-core": " ".join(f"{value:3.0f}%" for value in sample["core_percent"]) or "-",
+            "Load Average": " / ".join(f"{value:.2f}" for value in load) if load else "Unavailable",
+            "Memory": f"{size(memory.used)} / {size(memory.total)} ({memory.percent:.0f}%)",
+            "Disk": f"{size(disk.used)} / {size(disk.total)} ({disk.used / disk.total * 100:.0f}%)",
+            "Network": f"↑ {size(sample['net_sent_rate'])}/s  ↓ {size(sample['net_recv_rate'])}/s",
+            "Session Remaining": f"{remaining // 60}:{remaining % 60:02d}" if session is not None else "❌ Expired",
+            "Failed Login Attempts": str(self.security.get_failed_attempts()),
+            "Account Status": "🔒 Locked" if self.security.is_account_locked() else "🔓 Unlocked",
+        }
+    
+    def watch_status(self, interval: float):
+        """Live status dashboard, redrawn only when a displayed value changes"""
+        from rich.live import Live
+        
+        def render(values: Dict[str, str]):
+            table = rich_table.Table(title=f"📊 Live Status (every {interval:g}s, Ctrl-C to stop)",
+                                     show_header=True, header_style="bold magenta")
+            table.add_column("Metric", style="cyan", no_wrap=True)
+            table.add_column("Value", style="yellow")
+            for name, value in values.items():
+                table.add_row(name, value)
+            return table
+        
+        cancel_event = self.cancel_event
+        values = self._status_values()  # first frame: deltas since the sampler's last sample (primed at startup)
+        with Live(render(values), console=self.console, auto_refresh=False) as live:
+            while not cancel_event.wait(interval):
+                latest = self._status_values()
+                if latest != values:
+                    values = latest
+                    live.update(render(values), refresh=True)
+    
+    def _top_command(self, args: List[str]):
+        metric = "cpu"
+        count = 10
+        for arg in args:
+            if arg.lower() in ProcessTop.METRICS:
+                metric = arg.lower()
+            elif arg.isdigit():
+                count = max(1, int(arg))
+            else:
+                print(f"{Fore.RED}❌ Usage: top [cpu|rss|io] [count]{Style.RESET_ALL}")
+                return
+        self.show_top(metric, count, self.config.TOP_INTERVAL)
+    
+    def show_top(self, metric: str, count: int, interval: float):
+        """Live top-N process table until Ctrl-C"""
+        from rich.live import Live
+        
+        if self.process_top is None:
+            self.process_top = ProcessTop()
+        top = self.process_top
+        
+        def fmt(value: float) -> str:
+            if metric == "cpu":
+                return f"{value:.1f}%"
+            suffix = "/s" if metric == "io" else ""
+            for unit in ("B", "KB", "MB"):
+                if value < 1024:
+                    return f"{value:.0f} {unit}{suffix}" if unit == "B" else f"{value:.1f} {unit}{suffix}"
+                value /= 1024
+            return f"{value:.1f} GB{suffix}"
+        
+        def render(rows, elapsed_ms: float):
+            table = rich_table.Table(
+                title=f"⚙️ Top {count} processes by {metric.upper()} (every {interval:g}s, Ctrl-C to stop)",
+                caption=f"{top.count} processes, refreshed in {elapsed_ms:.0f} ms",
+                show_header=True, header_style="bold magenta")
+            table.add_column("PID", style="cyan", justify="right")
+            table.add_column("Name", style="green")
+            table.add_column(metric.upper(), style="yellow", justify="right")
+            for value, pid, process in rows:
+                try:
+                    name = process.name()  # only looked up for the rows shown
+                except psutil.Error:
+                    name = "?"
+                table.add_row(str(pid), name, fmt(value))
+            return table
+        
+        # CPU and I/O are rates, so the first table needs one short sampling window
+        cancel_event = self.cancel_event
+        top.refresh(metric, count)
+        if cancel_event.wait(min(interval, 0.5)):
+            return
+        
+        with Live(console=self.console, auto_refresh=False) as live:
+            while True:
+                start = time.perf_counter()
+                rows = top.refresh(metric, count)
+                live.update(render(rows, (time.perf_counter() - start) * 1000), refresh=True)
+                if cancel_event.wait(interval):
+                    break
+    
+    def _auditlog_command(self, args: List[str]):
+        usage = f"{Fore.RED}❌ Usage: auditlog {self.commands.get('auditlog').usage}{Style.RESET_ALL}"
+        options = {"since": None, "until": None, "level": None, "events": None, "limit": 50, "follow": False}
+        words = iter(args)
+        try:
+            for arg in words:
+                if arg in ("--follow", "-f"):
+                    options["follow"] = True
+                elif arg == "--since":
+                    options["since"] = AuditLogIndex.parse_time(next(words))
+                elif arg == "--until":
+                    options["until"] = AuditLogIndex.parse_time(next(words))
+                elif arg == "--level":
+                    options["level"] = next(words).upper()
+                    if options["level"] not in AuditLogIndex.LEVELS:
+                        raise ValueError(options["level"])
+                elif arg == "--event":
+                    options["events"] = [e for e in next(words).split(",") if e]
+                elif arg == "--limit":
+                    options["limit"] = max(1, int(next(words)))
+                else:
+                    raise ValueError(arg)
+        except (StopIteration, ValueError):
+            print(usage)
+            print(f"{Fore.YELLOW}💡 Times: 30m, 2h, 7d, today or 2024-12-13T15:30; "
+                  f"events: login_*, lockout, session_*; levels: {', '.join(AuditLogIndex.LEVELS)}{Style.RESET_ALL}")
+            return
+        
+        if self.audit_index is None:
+            self.audit_index = AuditLogIndex(self.config.log_file, self.config.audit_index_file)
+        levels = self.audit_index.levels_from(options["level"]) if options["level"] else None
+        
+        cancel_event = self.cancel_event
+        start = time.perf_counter()
+        records = self.audit_index.query(options["since"], options["until"], levels, options["events"],
+                                         options["limit"], cancel_event)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        for record in records:
+            if cancel_event.is_set():
+                return
+            self._print_audit_record(record)
+        print(f"{Fore.CYAN}📋 {len(records)} record(s) in {elapsed_ms:.1f} ms{Style.RESET_ALL}")
+        
+        if options["follow"]:
+            self.follow_audit_log(options["until"], levels, options["events"])
+    
+    def _print_audit_record(self, record: Dict):
+        colors = {"WARNING": Fore.YELLOW, "ERROR": Fore.RED, "CRITICAL": Fore.RED}
+        level = str(record.get("level", "INFO"))
+        ts = str(record.get("ts", ""))[:19].replace("T", " ")
+        session = str(record.get("session") or "-")[:8]
+        latency = f" ({record['latency_ms']} ms)" if "latency_ms" in record else ""
+        print(f"{Style.DIM}{ts}{Style.RESET_ALL} {colors.get(level, Fore.GREEN)}{level:<8}{Style.RESET_ALL}"
+              f"{Fore.CYAN}{str(record.get('event', 'message')):<18}{Style.RESET_ALL}{session:<9}"
+              f"{record.get('message', '')}{latency}")
+    
+    def follow_audit_log(self, until: Optional[datetime.datetime], levels: Optional[List[str]],
+                         events: Optional[List[str]]):
+        """Stream new audit records as they are written until Ctrl-C, following rotation"""
+        print(f"{Fore.CYAN}👀 Following {self.config.log_file.name} (Ctrl-C to stop){Style.RESET_ALL}")
+        cancel_event = self.cancel_event
+        f = None
+        from_start = False  # only records written after the command started
+        try:
+            while not cancel_event.is_set():
+                if f is None:
+                    try:
+                        f = open(self.config.log_file, "rb")
+                    except OSError:
+                        from_start = True
+                        cancel_event.wait(0.25)
+                        continue
+                    if not from_start:
+                        f.seek(0, os.SEEK_END)
+                
+                line = f.readline()
+                if line.endswith(b"\n"):
+                    record = AuditLogIndex.parse_record(line)
+                    if record is None:
+                        continue
+                    if levels and record.get("level") not in levels:
+                        continue
+                    if events and not any(fnmatch.fnmatchcase(str(record.get("event", "")), p) for p in events):
+                        continue
+                    if until:
+                        when = AuditLogIndex.record_time(record)
+                        if when is None or when > until:
+                            continue
+                    self._print_audit_record(record)
+                    continue
+                
+                # At the end of the file: wait for more, and reopen from the start after a rotation
+                f.seek(-len(line), os.SEEK_CUR)
+                if cancel_event.wait(0.25):
+                    break
+                try:
+                    rotated = os.stat(self.config.log_file).st_ino != os.fstat(f.fileno()).st_ino
+                except OSError:
+                    rotated = True
+                if rotated:
+                    f.close()
+                    f = None
+                    from_start = True
+        finally:
+            if f is not None:
+                f.close()
+    
     def show_system_info(self):
         """Display detailed system information"""
-        console = Console()
-        
-        with console.status("[bold green]Gathering system information..."):
-            time.sleep(1)  # Simulate gathering time
+        facts = self.metrics.static()
+        rule = f"{Fore.YELLOW}{'═' * 50}{Style.RESET_ALL}"
         
         # Create comprehensive system info panel
         info_text = f"""
 {Fore.CYAN}🖥️ SYSTEM INFORMATION{Style.RESET_ALL}
-{Fore.YELLOW}═" * 50{Style.RESET_ALL}
+{rule}
 
-{Fore.GREEN}Operating System:{Style.RESET_ALL} {platform.system()} {platform.release()}
-{Fore.GREEN}Architecture:{Style.RESET_ALL} {platform.machine()}
-{Fore.GREEN}Processor:{Style.RESET_ALL} {platform.processor()}
-{Fore.GREEN}Python Version:{Style.RESET_ALL} {platform.python_version()}
-{Fore.GREEN}Hostname:{Style.RESET_ALL} {platform.node()}
-{Fore.GREEN}User:{Style.RESET_ALL} {os.environ.get('USER', os.environ.get('USERNAME', 'Unknown'))}
+{Fore.GREEN}Operating System:{Style.RESET_ALL} {facts['system']}
+{Fore.GREEN}Architecture:{Style.RESET_ALL} {facts['machine']}
+{Fore.GREEN}Processor:{Style.RESET_ALL} {facts['processor']}
+{Fore.GREEN}Python Version:{Style.RESET_ALL} {facts['python']}
+{Fore.GREEN}Hostname:{Style.RESET_ALL} {facts['hostname']}
+{Fore.GREEN}User:{Style.RESET_ALL} {facts['user']}
 
 {Fore.CYAN}💾 MEMORY & STORAGE{Style.RESET_ALL}
-{Fore.YELLOW}═" * 50{Style.RESET_ALL}
+{rule}
 """
         
         try:
-            memory = psutil.virtual_memory()
-            disk = psutil.disk_usage('/')
-            
+            sample = self.metrics.sample()
+        except Exception:
+            sample = None
+        
+        if sample is not None:
+            memory = sample["memory"]
+            disk = sample["disk"]
             info_text += f"""
 {Fore.GREEN}Total Memory:{Style.RESET_ALL} {memory.total // (1024**3)} GB
 {Fore.GREEN}Available Memory:{Style.RESET_ALL} {memory.available // (1024**3)} GB
@@ -691,25 +3577,28 @@ class ZehraSecTerminal:
 {Fore.GREEN}Free Disk Space:{Style.RESET_ALL} {disk.free // (1024**3)} GB
 {Fore.GREEN}Disk Usage:{Style.RESET_ALL} {(disk.used / disk.total) * 100:.1f}%
 """
-        except:
+        else:
             info_text += f"{Fore.RED}Unable to retrieve memory/disk information{Style.RESET_ALL}\n"
         
         info_text += f"""
 {Fore.CYAN}⚡ CPU INFORMATION{Style.RESET_ALL}
-{Fore.YELLOW}═" * 50{Style.RESET_ALL}
+{rule}
 """
         
-        try:
+        if sample is not None:
+            load = sample["load"]
+            load_text = " / ".join(f"{value:.2f}" for value in load) if load else "Unavailable"
             info_text += f"""
-{Fore.GREEN}CPU Cores:{Style.RESET_ALL} {psutil.cpu_count()} ({psutil.cpu_count(logical=False)} physical)
-{Fore.GREEN}CPU Usage:{Style.RESET_ALL} {psutil.cpu_percent(interval=1)}%
+{Fore.GREEN}CPU Cores:{Style.RESET_ALL} {facts['cores']} ({facts['physical_cores']} physical)
+{Fore.GREEN}CPU Usage:{Style.RESET_ALL} {sample['cpu_percent']:.1f}% (since last sample)
+{Fore.GREEN}Load Average:{Style.RESET_ALL} {load_text} (1, 5, 15 min)
 """
-        except:
+        else:
             info_text += f"{Fore.RED}Unable to retrieve CPU information{Style.RESET_ALL}\n"
         
         info_text += f"""
 {Fore.CYAN}🌐 NETWORK & ENVIRONMENT{Style.RESET_ALL}
-{Fore.YELLOW}═" * 50{Style.RESET_ALL}
+{rule}
 
 {Fore.GREEN}Terminal:{Style.RESET_ALL} {os.environ.get('TERM', 'Unknown')}
 {Fore.GREEN}Shell:{Style.RESET_ALL} {os.environ.get('SHELL', 'Unknown')}
@@ -729,7 +3618,8 @@ class ZehraSecTerminal:
             current = getpass.getpass(f"{Fore.GREEN}Enter current password: {Style.RESET_ALL}")
             stored_hash = self.config.pass_file.read_text(encoding='utf-8').strip()
             
-            if not self.security.verify_password(current, stored_hash):
+            verified, _ = self._verify_with_spinner(current, stored_hash)
+            if not verified:
                 print(f"{Fore.RED}❌ Invalid current password.{Style.RESET_ALL}")
                 return
         
@@ -750,10 +3640,10 @@ class ZehraSecTerminal:
             break        
         # Save new password
         hashed = self.security.hash_password(new_password)
-        self.config.pass_file.write_text(hashed)
+        self.security.save_password_hash(hashed)
         
         print(f"{Fore.GREEN}✅ Password changed successfully!{Style.RESET_ALL}")
-        self.config.log_activity("Password changed successfully")
+        self.config.log_activity("Password changed successfully", event="password_changed")
     
     def change_banner_interactive(self):
         """Interactive banner customization menu"""
@@ -766,11 +3656,9 @@ class ZehraSecTerminal:
             print(f"{Fore.GREEN}4.{Style.RESET_ALL} Browse categories")
             print(f"{Fore.GREEN}5.{Style.RESET_ALL} Reset to default")
             print(f"{Fore.GREEN}6.{Style.RESET_ALL} Current banner info")
-            print(f"{Fore.CYAN}7.{Style.RESET_ALL} Create custom banner")
-            print(f"{Fore.CYAN}8.{Style.RESET_ALL} Manage custom banners")
             print(f"{Fore.GREEN}0.{Style.RESET_ALL} Back to main menu")
             
-            choice = input(f"\n{Fore.CYAN}Select option (0-8): {Style.RESET_ALL}").strip()
+            choice = input(f"\n{Fore.CYAN}Select option (0-6): {Style.RESET_ALL}").strip()
             
             if choice == "1":
                 self._select_banner_theme()
@@ -784,10 +3672,6 @@ class ZehraSecTerminal:
                 self.reset_banner()
             elif choice == "6":
                 self.show_current_banner_info()
-            elif choice == "7":
-                self.create_custom_banner_interactive()
-            elif choice == "8":
-                self._manage_custom_banners_menu()
             elif choice == "0":
                 break
             else:
@@ -817,9 +3701,12 @@ class ZehraSecTerminal:
             print(f"{Fore.RED}❌ No banners found in category: {category}{Style.RESET_ALL}")
             return
         
+        entries = self.ascii_art.banner_entries(category)
         print(f"\n{Fore.CYAN}🎨 Available banners in {category}:{Style.RESET_ALL}")
         for i, banner in enumerate(banners, 1):
-            print(f"{Fore.GREEN}{i}.{Style.RESET_ALL} {banner}")
+            info = entries.get(banner, {})
+            size = f" ({info['lines']} lines, {info['width']} cols)" if info else ""
+            print(f"{Fore.GREEN}{i}.{Style.RESET_ALL} {banner}{Fore.BLUE}{size}{Style.RESET_ALL}")
         
         try:
             choice = int(input(f"\n{Fore.CYAN}Select banner (1-{len(banners)}): {Style.RESET_ALL}"))
@@ -884,7 +3771,7 @@ class ZehraSecTerminal:
         print(f"{Fore.YELLOW}═" * 35 + f"{Style.RESET_ALL}")
         print(f"{Fore.GREEN}Category:{Style.RESET_ALL} {info['category']}")
         print(f"{Fore.GREEN}Filename:{Style.RESET_ALL} {info['filename']}")
-        print(f"{Fore.GREEN}Full Path:{Style.RESET_ALL} ascii_art/{info['category']}/{info['filename']}")
+        print(f"{Fore.GREEN}Full Path:{Style.RESET_ALL} {self.ascii_art.art_dir / info['category'] / info['filename']}")
     
     def change_prompt_interactive(self):
         """Interactive prompt customization menu"""
@@ -1002,12 +3889,23 @@ class ZehraSecTerminal:
         """Clean temporary files"""
         print(f"{Fore.CYAN}🧹 Cleaning temporary files...{Style.RESET_ALL}")
         
-        # Clean Python cache
+        # Clean Python cache, only under the install directory: the launchers no longer cd into it
+        install_dir = Path(__file__).resolve().parent
         cache_cleaned = 0
-        for root, dirs, files in os.walk('.'):
+        cancel_event = self.cancel_event
+        for root, dirs, files in os.walk(install_dir):
+            if cancel_event.is_set():
+                return
             if '__pycache__' in dirs:
-                import shutil
-                shutil.rmtree(os.path.join(root, '__pycache__'))
+                dirs.remove('__pycache__')
+                cache_dir = Path(root) / '__pycache__'
+                if cache_dir.is_symlink() or install_dir not in cache_dir.resolve().parents:
+                    continue
+                try:
+                    shutil.rmtree(cache_dir)
+                except OSError as e:
+                    print(f"{Fore.YELLOW}⚠️  Unable to remove {cache_dir}: {e}{Style.RESET_ALL}")
+                    continue
                 cache_cleaned += 1
         
         print(f"{Fore.GREEN}✅ Cleaned {cache_cleaned} cache directories{Style.RESET_ALL}")
@@ -1082,115 +3980,84 @@ class ZehraSecTerminal:
         args = parts[1:] if len(parts) > 1 else []
         
         # Command processing
-        if cmd in ['exit', 'quit']:
-            return False
-        elif cmd == 'logout':
-            print(f"{Fore.YELLOW}👋 Logging out... Session ended.{Style.RESET_ALL}")
-            if self.config.session_file.exists():
-                self.config.session_file.unlink()
-            return False
-        elif cmd == 'help':
-            self.show_help()
-        elif cmd == 'status':
-            self.show_status()
-        elif cmd == 'clear':
-            self.display_banner()
-        elif cmd == 'matrix':
-            self.matrix.run_matrix(3)
-            self.display_banner()
-        elif cmd == 'sysinfo':
-            self.show_system_info()
-        elif cmd == 'changepass':
-            self.change_password()
-        elif cmd in ['changebanner', 'setbanner']:
-            self.change_banner_interactive()
-        elif cmd == 'randombanner':
-            self.set_random_banner()
-        elif cmd == 'previewthemes':
-            self._preview_themes()
-        elif cmd == 'resetbanner':
-            self.reset_banner()
-        elif cmd == 'browseart':
-            self._browse_art_categories()
-        elif cmd == 'currentbanner':
-            self.show_current_banner_info()
-        elif cmd in ['changeprompt', 'prompt']:
-            self.change_prompt_interactive()
-        elif cmd == 'setprompt':
-            prompt_text = ' '.join(args) if args else ''
-            self.set_prompt_direct(prompt_text)
-        elif cmd == 'resetprompt':
-            self.reset_prompt()
-        elif cmd == 'listprompts':
-            self.list_prompts()
-        elif cmd == 'currentprompt':
-            self.show_current_prompt_info()
-        elif cmd == 'clean':
-            self.clean_temp_files()
-        elif cmd == 'backup':
-            self.backup_settings()
-        elif cmd == 'restore':
-            self.restore_settings()
-        elif cmd == 'update':
-            print(f"{Fore.CYAN}🔄 Checking for updates...{Style.RESET_ALL}")
-            print(f"{Fore.GREEN}✅ ZehraSec Terminal v2.2.0 is up to date!{Style.RESET_ALL}")
-        elif cmd == 'createbanner':
-            self.create_custom_banner_interactive()
-        elif cmd == 'addbanner':
-            if args:
-                name = args[0]
-                self.create_custom_banner_direct(name)
-            else:
-                print(f"{Fore.RED}❌ Usage: addbanner <name>{Style.RESET_ALL}")
-        elif cmd == 'editbanner':
-            if args:
-                name = args[0]
-                self.edit_custom_banner(name)
-            else:
-                print(f"{Fore.RED}❌ Usage: editbanner <name>{Style.RESET_ALL}")
-        elif cmd == 'deletebanner':
-            if args:
-                name = args[0]
-                self.delete_custom_banner(name)
-            else:
-                print(f"{Fore.RED}❌ Usage: deletebanner <name>{Style.RESET_ALL}")
-        elif cmd == 'listcustom':
-            self.list_custom_banners()
-        elif cmd == 'importbanner':
-            if len(args) >= 2:
-                source_path = args[0]
-                name = args[1]
-                self.import_banner_from_file(source_path, name)
-            else:
-                print(f"{Fore.RED}❌ Usage: importbanner <source_file> <name>{Style.RESET_ALL}")
-        elif cmd == 'exportbanner':
-            if len(args) >= 2:
-                name = args[0]
-                dest_path = args[1]
-                self.export_custom_banner(name, dest_path)
-            else:
-                print(f"{Fore.RED}❌ Usage: exportbanner <name> <destination_file>{Style.RESET_ALL}")
-        else:
+        entry = self.commands.get(cmd)
+        if entry is None:
             print(f"{Fore.RED}❌ Unknown command: {cmd}{Style.RESET_ALL}")
             print(f"{Fore.YELLOW}💡 Type 'help' to see available commands{Style.RESET_ALL}")
+            return True
+        if len(args) < entry.min_args:
+            print(f"{Fore.RED}❌ Usage: {entry.name} {entry.usage}{Style.RESET_ALL}")
+            return True
         
-        return True
+        started = time.perf_counter()
+        try:
+            return entry(args) is not False
+        finally:
+            self.config.log_activity(f"Command {entry.name}", event="command", command=entry.name,
+                                     latency_ms=round((time.perf_counter() - started) * 1000, 1))
     
     def run(self):
         """Main terminal loop"""
         # Display banner
         self.display_banner()
+        self.profiler.mark("banner")
         
         # Authenticate user
         if not self.authenticate():
             print(f"{Fore.RED}❌ Authentication failed. Exiting...{Style.RESET_ALL}")
             return
         
+        # Warm up psutil and the CPU baseline while the welcome animation plays
+        threading.Thread(target=self._prime_metrics, name="zehrasec-metrics", daemon=True).start()
+        
         # Display welcome message
         self.matrix.typing_effect(f"{Fore.GREEN}🛡️ Welcome to ZehraSec Terminal! Type 'help' for commands.{Style.RESET_ALL}")
         print()
         
+        # SIGTERM/SIGHUP unwind through the finally block so state is saved on the way out
+        for name in ("SIGTERM", "SIGHUP"):
+            if hasattr(signal, name):
+                signal.signal(getattr(signal, name), self._on_terminate)
+        
+        # Expire idle sessions while they sit at the prompt, not only after the next command
+        self.watchdog = DeadlineWatchdog()
+        if self.security.session is not None:
+            self.watchdog.schedule(self.security.session.deadline, self._check_session_deadline)
+            self.watchdog.schedule(time.monotonic() + self.config.SESSION_HEARTBEAT_INTERVAL, self._heartbeat)
+        
         # Main command loop
+        try:
+            asyncio.run(self._repl())
+        except SessionExpired:
+            print(f"\n{Fore.RED}⏰ Session expired. Please log in again.{Style.RESET_ALL}")
+        except KeyboardInterrupt:
+            print(f"\n{Fore.YELLOW}👋 ZehraSec Terminal session terminated.{Style.RESET_ALL}")
+        except EOFError:
+            print(f"\n{Fore.YELLOW}👋 ZehraSec Terminal session ended.{Style.RESET_ALL}")
+        finally:
+            # Clean up session
+            self.watchdog.stop()
+            self.config.log_activity("Session ended", event="session_end")
+            self.security.end_session()
+            self.config.state.close()
+    
+    async def _repl(self):
+        """Read-eval loop on asyncio: stdin, commands and background jobs never block each other"""
+        loop = asyncio.get_running_loop()
+        self._loop = loop
+        self._reader = LineReader(loop)
+        tty_attrs = self._save_tty()
+        
+        try:
+            loop.add_signal_handler(signal.SIGINT, self._on_interrupt)
+            sigint_handled = True
+        except (NotImplementedError, AttributeError, RuntimeError):
+            sigint_handled = False  # Windows: Ctrl-C raises KeyboardInterrupt and ends the session
+        
+        jobs = []
+        if self.config.STATUS_TICKER and sys.stdout.isatty():
+            jobs.append(loop.create_task(self._status_ticker()))
+        
         try:
             while True:
                 # Check session validity
@@ -1200,34 +4067,155 @@ class ZehraSecTerminal:
                 
                 # Display prompt
                 prompt_display = f"{Fore.CYAN}[{self.current_prompt}]${Style.RESET_ALL} "
-                command = input(prompt_display)
+                self._at_prompt = True
+                try:
+                    command = await self._reader.read(prompt_display)
+                finally:
+                    self._at_prompt = False
                 
                 # Process command
-                if not self.process_command(command):
+                if not await self._run_command(command, sigint_handled):
                     break
-                    
+        finally:
+            for job in jobs:
+                job.cancel()
+            await asyncio.gather(*jobs, return_exceptions=True)
+            if sigint_handled:
+                loop.remove_signal_handler(signal.SIGINT)
+            self._restore_tty(tty_attrs)
+            self._loop = None
+    
+    async def _run_command(self, command: str, sigint_handled: bool) -> bool:
+        """Adapter running the synchronous process_command without blocking the loop when possible"""
+        parts = command.split()
+        name = parts[0].lower() if parts else ""
+        
+        entry = self.commands.get(name)
+        if entry is not None and entry.threaded:
+            # A fresh event per run: a command abandoned after CANCEL_GRACE still sees its own
+            # cancellation instead of a cleared flag, and stops rather than printing over the prompt
+            self.cancel_event = threading.Event()
+            self._command_future = run_in_daemon_thread(self._loop, self.process_command, command)
+            try:
+                return await self._command_future
+            except asyncio.CancelledError:
+                print(f"\n{Style.RESET_ALL}{Fore.YELLOW}⏹️  {name} cancelled{Style.RESET_ALL}")
+                return True
+            except Exception as e:
+                return self._command_failed(name, e)
+            finally:
+                self._command_future = None
+        
+        # Interactive commands own the terminal, so they run here; Ctrl-C raises inside them
+        if sigint_handled:
+            self._loop.remove_signal_handler(signal.SIGINT)
+        try:
+            return self.process_command(command)
         except KeyboardInterrupt:
-            print(f"\n{Fore.YELLOW}👋 ZehraSec Terminal session terminated.{Style.RESET_ALL}")
-        except EOFError:
-            print(f"\n{Fore.YELLOW}👋 ZehraSec Terminal session ended.{Style.RESET_ALL}")
+            print(f"\n{Fore.YELLOW}⏹️  {name} cancelled{Style.RESET_ALL}")
+            return True
+        except Exception as e:
+            return self._command_failed(name, e)
         finally:
-            # Clean up session
-            if self.config.session_file.exists():
-                self.config.session_file.unlink()
-            self.config.log_activity("Session ended")
-
+            if sigint_handled:
+                self._loop.add_signal_handler(signal.SIGINT, self._on_interrupt)
+    
+    def _command_failed(self, name: str, error: Exception) -> bool:
+        """A command raised: report and log it, then carry on at the prompt"""
+        print(f"\n{Style.RESET_ALL}{Fore.RED}❌ {name} failed: {error}{Style.RESET_ALL}")
+        self.config.log_activity(f"Command {name} failed: {error!r}", "ERROR", event="command_error",
+                                 exc_info=True, command=name)
+        return True
+    
+    def _on_interrupt(self):
+        """Ctrl-C: cancel the running command, or end the session when at the prompt"""
+        future = self._command_future
+        if future is not None and not future.done():
+            self.cancel_event.set()
+            self._loop.call_later(self.CANCEL_GRACE, future.cancel)
+        else:
+            self._reader.interrupt(KeyboardInterrupt())
+    
+    async def _status_ticker(self):
+        """Background job keeping the terminal title updated with the prompt, idle timeout and clock"""
+        interval = max(0.5, self.config.STATUS_TICKER_INTERVAL)
+        sys.stdout.write("\033[22;0t")  # push the current title
+        try:
+            while True:
+                session = self.security.session
+                if session is not None and self._command_future is None:
+                    remaining = max(0, int(session.remaining()))
+                    title = (f"ZehraSec [{self.current_prompt}] - idle timeout {remaining // 60}:{remaining % 60:02d}"
+                             f" - {time.strftime('%H:%M')}")
+                    sys.stdout.write(f"\033]0;{title}\007")
+                    sys.stdout.flush()
+                await asyncio.sleep(interval)
+        finally:
+            sys.stdout.write("\033[23;0t")  # restore it
+            sys.stdout.flush()
+    
+    def _save_tty(self):
+        """Remember terminal modes; an abandoned input() may leave them changed"""
+        try:
+            import termios
+            return termios.tcgetattr(sys.stdin.fileno())
+        except (ImportError, OSError, ValueError, AttributeError):
+            return None
+    
+    def _restore_tty(self, attrs):
+        if attrs is not None:
+            import termios
+            try:
+                termios.tcsetattr(sys.stdin.fileno(), termios.TCSADRAIN, attrs)
+            except (OSError, ValueError):
+                pass
+    
+    def _check_session_deadline(self):
+        """Watchdog callback: reschedule if there was activity, otherwise expire the session"""
+        session = self.security.session
+        if session is None:
+            return
+        if session.is_valid():
+            self.watchdog.schedule(session.deadline, self._check_session_deadline)
+            return
+        
+        self.config.log_activity(f"Session {session.id} expired after {session.timeout}s idle", "WARNING",
+                                 event="session_expired")
+        loop = self._loop
+        if loop is not None and self._at_prompt:
+            # A running command finishes first; the loop checks validity afterwards
+            loop.call_soon_threadsafe(self._reader.interrupt, SessionExpired())
+    
+    def _heartbeat(self):
+        """Watchdog callback: show other terminals this session is alive"""
+        if self.security.session is None:
+            return
+        self.security.persist_session()
+        self.watchdog.schedule(time.monotonic() + self.config.SESSION_HEARTBEAT_INTERVAL, self._heartbeat)
+    
+    def _on_terminate(self, signum, frame):
+        """Turn termination signals into a normal exit"""
+        self.config.log_activity(f"Received signal {signum}, ending session", "WARNING", event="signal")
+        raise SystemExit(128 + signum)
+    
     def _get_current_banner_info(self) -> Tuple[str, str]:
         """Get current banner category and filename"""
-        try:
-            if self.config.banner_file.exists():
-                banner_info = json.loads(self.config.banner_file.read_text(encoding='utf-8'))
-                return banner_info.get("category", "logoasciiart"), banner_info.get("filename", "zehrasec_inc.txt")
-        except:
-            pass
+        banner_info = self.config.state.get("banner") or {}
+        if isinstance(banner_info, dict):
+            return banner_info.get("category", "logoasciiart"), banner_info.get("filename", "zehrasec_inc.txt")
         return "logoasciiart", "zehrasec_inc.txt"
 
 def main():
     """Main entry point"""
+    profiler = StartupProfiler("--profile-startup" in sys.argv[1:])
+    profiler.mark("module imports")
+    
+    missing = missing_modules()
+    if missing:
+        print(f"Error: Missing required packages. Please run: pip install -r requirements.txt")
+        print(f"Specific error: No module named {', '.join(missing)}")
+        sys.exit(1)
+    
     # Fix Windows console encoding issues
     if platform.system() == "Windows":
         try:
@@ -1245,13 +4233,13 @@ def main():
                 pass
     
     try:
-        terminal = ZehraSecTerminal()
+        terminal = ZehraSecTerminal(profiler)
         terminal.run()
     except KeyboardInterrupt:
         print(f"\n{Fore.YELLOW}👋 ZehraSec Terminal interrupted.{Style.RESET_ALL}")
     except Exception as e:
         print(f"{Fore.RED}❌ Fatal error: {e}{Style.RESET_ALL}")
-        logging.error(f"Fatal error: {e}")
+        logging.exception(f"Fatal error: {e!r}")
 
 if __name__ == "__main__":
     main()